@@ -0,0 +1,325 @@
+import numpy as np
+
+from .black_jack import hit, stick, dealer_policy, target_policy_player
+
+# region Functions
+
+# region Policies
+
+def policy_table(policy_player):
+    # region Summary
+    """
+    Tabulate a deterministic policy of player for the batch simulator.
+    :param policy_player: Policy of player, called with (usable_ace_player, player_sum, dealer_card)
+    :return: (2, 22, 11) table of probabilities of sticking, indexed by [usable_ace_player, player_sum, dealer_card]
+    """
+    # endregion Summary
+
+    # region Body
+
+    table = np.zeros((2, 22, 11))
+
+    # The player decides only when the sum of his cards is 12–21
+    for usable_ace in (0, 1):
+        for player_sum in range(12, 22):
+            for dealer_card in range(1, 11):
+                table[usable_ace, player_sum, dealer_card] = float(policy_player(bool(usable_ace), player_sum, dealer_card) == stick)
+
+    return table
+
+    # endregion Body
+
+# Target policy of player (sticks on 20 and 21, otherwise hits)
+target_policy_table = policy_table(target_policy_player)
+
+# Behavior policy of player for Off-policy Monte Carlo Sampling (sticks or hits with equal probability)
+behavior_off_policy_table = np.full((2, 22, 11), 0.5)
+
+# endregion Policies
+
+# region Cards
+
+def draw_cards(random_generator, size):
+    # region Summary
+    """
+    Get a block of new cards.
+    :param random_generator: np.random.Generator
+    :param size: Number of cards
+    :return: Cards (face cards count as 10)
+    """
+    # endregion Summary
+
+    # region Body
+
+    return np.minimum(random_generator.integers(1, 14, size=size), 10)
+
+    # endregion Body
+
+def card_values(cards):
+    # region Summary
+    """
+    Get the values of cards.
+    :param cards: Cards' IDs
+    :return: Cards' values (11 for ace, card's ID for the rest)
+    """
+    # endregion Summary
+
+    # region Body
+
+    return np.where(cards == 1, 11, cards)
+
+    # endregion Body
+
+def update_cards(card_sums, usable_aces, random_generator):
+    # region Summary
+    """
+    Give 1 new card to each of several hands and update their sums and counts of aces (vectorized update_cards of black_jack.py)
+    :param card_sums: Sums of cards
+    :param usable_aces: Whether aces are usable
+    :param random_generator: np.random.Generator
+    :return: Updated sums of cards and counts of aces
+    """
+    # endregion Summary
+
+    # region Body
+
+    # Get new cards
+    new_cards = draw_cards(random_generator, card_sums.size)
+
+    # Keep track of the ace counts, incremented by new aces
+    ace_counts = usable_aces.astype(np.int64) + (new_cards == 1)
+
+    # Add the new cards' values to the sums of cards
+    card_sums = card_sums + card_values(new_cards)
+
+    # Use aces as 1 to avoid busting (a hand counts at most 2 aces as 11 at this point)
+    for _ in range(2):
+        use_ace = (card_sums > 21) & (ace_counts > 0)
+        card_sums -= 10 * use_ace
+        ace_counts -= use_ace
+
+    return card_sums, ace_counts
+
+    # endregion Body
+
+# endregion Cards
+
+def play_batch(episodes, policy_player=target_policy_table, initial_state=None, initial_action=None, random_generator=None):
+    # region Summary
+    """
+    Play a batch of games at once: cards are drawn in blocks for all unfinished hands, which are advanced together.
+    :param episodes: Number of episodes (games)
+    :param policy_player: (2, 22, 11) table of probabilities of sticking, indexed by [usable_ace_player, player_sum, dealer_card]
+    :param initial_state: Whether player has a usable ace, sum of player's cards, 1 card of dealer: 1 state for all episodes or (episodes, 3) states
+    :param initial_action: The initial action: 1 action for all episodes or (episodes,) actions
+    :param random_generator: np.random.Generator (a fresh one, if None)
+    :return: (episodes, 3) initial states, (episodes,) rewards and player trajectories as flat arrays:
+             (steps, 3) states, (steps,) actions and (episodes + 1,) offsets (episode i is steps offsets[i]:offsets[i + 1])
+    """
+    # endregion Summary
+
+    # region Body
+
+    random_generator = np.random.default_rng() if random_generator is None else random_generator
+
+    # region Player
+
+    # If no initial state is given, generate random initial states:
+    if initial_state is None:
+        player_sums = np.zeros(episodes, dtype=np.int64)
+        usable_aces_player = np.zeros(episodes, dtype=bool)
+
+        # while sum of player's cards is less than 12, always hit
+        drawing = np.arange(episodes)
+        while drawing.size:
+            cards = draw_cards(random_generator, drawing.size)
+            sums = player_sums[drawing] + card_values(cards)
+
+            # If the sum of player's cards is larger than 21, he holds 2 aces: use the last one as 1
+            bust = sums > 21
+            sums[bust] -= 10
+
+            # Otherwise, track if the player has at least one usable ace
+            usable_aces_player[drawing] |= ~bust & (cards == 1)
+
+            player_sums[drawing] = sums
+            drawing = drawing[sums < 12]
+
+        # Initialize cards of dealer (suppose dealer will show the 1st card he gets)
+        dealer_cards1 = draw_cards(random_generator, episodes)
+        dealer_cards2 = draw_cards(random_generator, episodes)
+
+    else: # use specified initial states
+        initial_state = np.broadcast_to(np.asarray(initial_state, dtype=np.int64), (episodes, 3))
+        usable_aces_player = initial_state[:, 0].astype(bool)
+        player_sums = initial_state[:, 1].copy()
+        dealer_cards1 = initial_state[:, 2].copy()
+        dealer_cards2 = draw_cards(random_generator, episodes)
+
+    # States of the games
+    initial_states = np.stack([usable_aces_player, player_sums, dealer_cards1], axis=1).astype(np.int64)
+
+    # endregion Player
+
+    # region Dealer
+
+    # Sums of dealer's cards
+    dealer_sums = card_values(dealer_cards1) + card_values(dealer_cards2)
+
+    # Whether dealer has a usable ace
+    usable_aces_dealer = (dealer_cards1 == 1) | (dealer_cards2 == 1)
+
+    # If the sum of dealer's cards is greater than 21, he must hold 2 aces: use one ace as 1 rather than 11
+    dealer_sums[dealer_sums > 21] -= 10
+
+    # endregion Dealer
+
+    # region Game
+
+    rewards = np.zeros(episodes, dtype=np.int64)
+
+    # Trajectory records of every round: episode, state and action
+    recorded_episodes, recorded_states, recorded_actions = [], [], []
+
+    # Episodes in which the player sticks
+    sticking = []
+
+    # Player's turn for all unfinished hands
+    playing = np.arange(episodes)
+    first_round = True
+    while playing.size:
+        if first_round and initial_action is not None:
+            actions = np.broadcast_to(np.asarray(initial_action, dtype=np.int64), (episodes,))[playing]
+        else:
+            # Get actions based on current states
+            stick_probabilities = policy_player[usable_aces_player[playing].astype(np.int64), player_sums[playing], dealer_cards1[playing]]
+            actions = np.where(random_generator.random(playing.size) < stick_probabilities, stick, hit)
+        first_round = False
+
+        # Track players' trajectories for importance sampling
+        recorded_episodes.append(playing)
+        recorded_states.append(np.stack([usable_aces_player[playing], player_sums[playing], dealer_cards1[playing]], axis=1))
+        recorded_actions.append(actions)
+
+        # If player sticks, then it becomes the dealer’s turn
+        sticks = actions == stick
+        sticking.append(playing[sticks])
+
+        # If player hits, update player's cards
+        hitting = playing[~sticks]
+        sums, ace_counts = update_cards(player_sums[hitting], usable_aces_player[hitting], random_generator)
+        player_sums[hitting] = sums
+
+        # Check if player busts
+        bust = sums > 21
+        rewards[hitting[bust]] = -1
+
+        # If player doesn't bust, then he can have a usable ace if he has only 1 ace
+        usable_aces_player[hitting] = ace_counts == 1
+        playing = hitting[~bust]
+
+    # Dealer's turn for all hands in which the player sticks
+    sticking = np.concatenate(sticking)
+    dealing = sticking
+    while dealing.size:
+        # Dealer sticks or hits based on current sums
+        dealing = dealing[dealer_policy[dealer_sums[dealing]] == hit]
+
+        # If dealer hits, update dealer's cards
+        sums, ace_counts = update_cards(dealer_sums[dealing], usable_aces_dealer[dealing], random_generator)
+        dealer_sums[dealing] = sums
+
+        # Check if dealer busts
+        bust = sums > 21
+        rewards[dealing[bust]] = 1
+
+        # If dealer doesn't bust, then he can have a usable ace if he has only 1 ace
+        usable_aces_dealer[dealing] = ace_counts == 1
+        dealing = dealing[~bust]
+
+    # endregion Game
+
+    # region Winner
+
+    # Compare the sum of cards between player and dealer, if the dealer doesn't bust
+    comparing = sticking[dealer_sums[sticking] <= 21]
+    rewards[comparing] = np.sign(player_sums[comparing] - dealer_sums[comparing])
+
+    # endregion Winner
+
+    # region Trajectories
+
+    # Order the records by episode (records of each episode stay in round order)
+    recorded_episodes = np.concatenate(recorded_episodes)
+    order = np.argsort(recorded_episodes, kind='stable')
+    states = np.concatenate(recorded_states).astype(np.int64)[order]
+    actions = np.concatenate(recorded_actions)[order]
+
+    # Episode i is held by records offsets[i]:offsets[i + 1]
+    offsets = np.zeros(episodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(recorded_episodes, minlength=episodes), out=offsets[1:])
+
+    # endregion Trajectories
+
+    return initial_states, rewards, states, actions, offsets
+
+    # endregion Body
+
+def play_exploring_starts(episodes, policy_player, random_generator=None):
+    # region Summary
+    """
+    Play a batch of games with exploring starts: random initial states (every state is possible) and random initial actions.
+    :param episodes: Number of episodes (games)
+    :param policy_player: (2, 22, 11) table of probabilities of sticking followed after the initial action
+    :param random_generator: np.random.Generator (a fresh one, if None)
+    :return: Initial states, rewards, states, actions and offsets, as play_batch()
+    """
+    # endregion Summary
+
+    # region Body
+
+    random_generator = np.random.default_rng() if random_generator is None else random_generator
+
+    # Use randomly initialized states: usable ace, sum of player's cards (12–21), dealer's card (1–10)
+    initial_state = np.stack([random_generator.integers(0, 2, episodes),
+                              random_generator.integers(12, 22, episodes),
+                              random_generator.integers(1, 11, episodes)], axis=1)
+
+    # Use randomly initialized actions
+    initial_action = random_generator.integers(0, 2, episodes)
+
+    return play_batch(episodes, policy_player, initial_state, initial_action, random_generator)
+
+    # endregion Body
+
+def monte_carlo_on_policy_batch(episodes, random_generator=None):
+    # region Summary
+    """
+    Monte Carlo On-Policy Sampling over a batch of episodes played by play_batch()
+    :param episodes: Number of episodes
+    :param random_generator: np.random.Generator (a fresh one, if None)
+    :return: Sample-average of returns of states with usable ace, sample-average of returns of states with no usable ace
+    """
+    # endregion Summary
+
+    # region Body
+
+    _, rewards, states, _, offsets = play_batch(episodes, target_policy_table, random_generator=random_generator)
+
+    # Every state of an episode receives the episode's reward
+    step_rewards = np.repeat(rewards, np.diff(offsets))
+
+    # Flat index of every state in a (2, 10, 10) table: usable ace, sum of player's cards (12–21 → 0–9), dealer's card (1–10 → 0–9)
+    indices = np.ravel_multi_index((states[:, 0], states[:, 1] - 12, states[:, 2] - 1), (2, 10, 10))
+
+    # Sums of returns and counts of visits (initialized with 1s in order to avoid division by 0)
+    returns = np.bincount(indices, weights=step_rewards, minlength=200).reshape(2, 10, 10)
+    counts = 1 + np.bincount(indices, minlength=200).reshape(2, 10, 10)
+
+    average = returns / counts
+
+    return average[1], average[0]
+
+    # endregion Body
+
+# endregion Functions
@@ -0,0 +1,243 @@
+import numpy as np
+
+from .black_jack import hit, stick, dealer_policy, card_value
+from .batch_black_jack import target_policy_table
+
+# region Functions
+
+# region Dynamics
+
+def hit_outcome(card_sum, usable_ace, card):
+    # region Summary
+    """
+    Deterministic outcome of update_cards() of black_jack.py for a given new card.
+    :param card_sum: Sum of cards
+    :param usable_ace: Whether ace is usable
+    :param card: New card
+    :return: Updated sum of cards (> 21 if bust) and whether ace is usable
+    """
+    # endregion Summary
+
+    # region Body
+
+    ace_count = int(usable_ace) + (card == 1)
+    card_sum += card_value(card)
+
+    # Use aces as 1 to avoid busting
+    while card_sum > 21 and ace_count:
+        card_sum -= 10
+        ace_count -= 1
+
+    return card_sum, ace_count == 1
+
+    # endregion Body
+
+def dealer_outcome_distribution(dealer_sum, usable_ace, memory):
+    # region Summary
+    """
+    Distribution of the dealer's final sum, when he follows dealer_policy from a given hand.
+    :param dealer_sum: Sum of dealer's cards
+    :param usable_ace: Whether dealer has a usable ace
+    :param memory: Dictionary of distributions already computed, keyed by (dealer_sum, usable_ace)
+    :return: (6,) probabilities of final sums 17, 18, 19, 20, 21 and of busting
+    """
+    # endregion Summary
+
+    # region Body
+
+    if (dealer_sum, usable_ace) in memory:
+        return memory[(dealer_sum, usable_ace)]
+
+    distribution = np.zeros(6)
+
+    # If dealer sticks, his sum is final
+    if dealer_policy[dealer_sum] == stick:
+        distribution[dealer_sum - 17] = 1.0
+
+    # If dealer hits, average over the new card
+    else:
+        for card in range(1, 11):
+            next_sum, next_usable_ace = hit_outcome(dealer_sum, usable_ace, card)
+            if next_sum > 21:
+                distribution[5] += card_probability[card]
+            else:
+                distribution += card_probability[card] * dealer_outcome_distribution(next_sum, next_usable_ace, memory)
+
+    memory[(dealer_sum, usable_ace)] = distribution
+    return distribution
+
+    # endregion Body
+
+def compute_dealer_final_distribution():
+    # region Summary
+    """
+    Distribution of the dealer's final sum for each showing card, averaged over his hidden card.
+    :return: (10, 6) probabilities indexed by [dealer_card - 1, final sum 17–21 (0–4) or bust (5)]
+    """
+    # endregion Summary
+
+    # region Body
+
+    memory = dict()
+    distribution = np.zeros((10, 6))
+
+    for dealer_card1 in range(1, 11):
+        for dealer_card2 in range(1, 11):
+            # Initial hand of dealer, as dealt in play()
+            dealer_sum = card_value(dealer_card1) + card_value(dealer_card2)
+            usable_ace = 1 in (dealer_card1, dealer_card2)
+            if dealer_sum > 21:
+                dealer_sum -= 10
+
+            distribution[dealer_card1 - 1] += card_probability[dealer_card2] * dealer_outcome_distribution(dealer_sum, usable_ace, memory)
+
+    return distribution
+
+    # endregion Body
+
+def compute_player_transitions():
+    # region Summary
+    """
+    Transition tensor of the player's hand, when he hits.
+    :return: (2, 10, 2, 10) probabilities indexed by [usable_ace, player_sum - 12, next usable_ace, next player_sum - 12]
+             and (2, 10) probabilities of busting indexed by [usable_ace, player_sum - 12]
+    """
+    # endregion Summary
+
+    # region Body
+
+    transitions = np.zeros((2, 10, 2, 10))
+    bust_probability = np.zeros((2, 10))
+
+    for usable_ace in (0, 1):
+        for player_sum in range(12, 22):
+            for card in range(1, 11):
+                next_sum, next_usable_ace = hit_outcome(player_sum, usable_ace, card)
+                if next_sum > 21:
+                    bust_probability[usable_ace, player_sum - 12] += card_probability[card]
+                else:
+                    transitions[usable_ace, player_sum - 12, int(next_usable_ace), next_sum - 12] += card_probability[card]
+
+    return transitions, bust_probability
+
+    # endregion Body
+
+def compute_stick_rewards():
+    # region Summary
+    """
+    Expected reward of sticking.
+    :return: (10, 10) expected rewards indexed by [player_sum - 12, dealer_card - 1]
+    """
+    # endregion Summary
+
+    # region Body
+
+    player_sums = np.arange(12, 22)[:, None]
+    dealer_sums = np.arange(17, 22)[None, :]
+
+    # The player wins if the dealer busts or ends with a lower sum, and loses if the dealer ends with a higher sum
+    win = (player_sums > dealer_sums).astype(float)
+    loss = (player_sums < dealer_sums).astype(float)
+
+    return dealer_final_distribution[:, 5][None, :] + (win - loss) @ dealer_final_distribution[:, :5].T
+
+    # endregion Body
+
+# endregion Dynamics
+
+# region Dynamic Programming
+
+def solve(policy_player=None):
+    # region Summary
+    """
+    Compute exact state-action values by dynamic programming. The player's hand only moves to higher hard sums, to higher
+    soft sums, or from soft to hard, so states are solved once each: hard sums from 21 down, then soft sums from 21 down.
+    :param policy_player: (2, 22, 11) table of probabilities of sticking; if None, solve for the optimal policy
+    :return: (10, 10, 2, 2) state-action values indexed by [player_sum - 12, dealer_card - 1, usable_ace, action], as monte_carlo_es()
+    """
+    # endregion Summary
+
+    # region Body
+
+    # State values indexed by [usable_ace, player_sum - 12, dealer_card - 1]
+    state_values = np.zeros((2, 10, 10))
+
+    # State-action values indexed by [usable_ace, player_sum - 12, dealer_card - 1, action]
+    state_action_values = np.zeros((2, 10, 10, 2))
+
+    for usable_ace in (0, 1):
+        for player_sum in reversed(range(10)):
+            # Value of hitting: expected value of the next hand, -1 if bust
+            hit_values = np.tensordot(player_transitions[usable_ace, player_sum], state_values, axes=2) - player_bust_probability[usable_ace, player_sum]
+
+            state_action_values[usable_ace, player_sum, :, hit] = hit_values
+            state_action_values[usable_ace, player_sum, :, stick] = stick_rewards[player_sum]
+
+            if policy_player is None:
+                # Bellman optimality equation
+                state_values[usable_ace, player_sum] = np.maximum(hit_values, stick_rewards[player_sum])
+            else:
+                # Bellman equation for the policy
+                stick_probability = policy_player[usable_ace, player_sum + 12, 1:]
+                state_values[usable_ace, player_sum] = stick_probability * stick_rewards[player_sum] + (1 - stick_probability) * hit_values
+
+    return state_action_values.transpose(1, 2, 0, 3)
+
+    # endregion Body
+
+def state_values(policy_player=target_policy_table):
+    # region Summary
+    """
+    Exact state values of a policy.
+    :param policy_player: (2, 22, 11) table of probabilities of sticking
+    :return: Values of states with usable ace, values of states with no usable ace, indexed by [player_sum - 12, dealer_card - 1], as monte_carlo_on_policy()
+    """
+    # endregion Summary
+
+    # region Body
+
+    state_action_values = solve(policy_player)
+
+    # Average the action values over the policy
+    stick_probability = policy_player[:, 12:22, 1:].transpose(1, 2, 0)
+    values = stick_probability * state_action_values[..., stick] + (1 - stick_probability) * state_action_values[..., hit]
+
+    return values[:, :, 1], values[:, :, 0]
+
+    # endregion Body
+
+def optimal_policy():
+    # region Summary
+    """
+    Optimal policy and values of Blackjack.
+    :return: (10, 10, 2) optimal actions and (10, 10, 2) optimal state values, indexed by [player_sum - 12, dealer_card - 1, usable_ace]
+    """
+    # endregion Summary
+
+    # region Body
+
+    state_action_values = solve()
+
+    return np.argmax(state_action_values, axis=-1), np.max(state_action_values, axis=-1)
+
+    # endregion Body
+
+# endregion Dynamic Programming
+
+# endregion Functions
+
+# region Fields
+
+# Probability of each card (index = card's ID): 1/13 for ace and 2–9, 4/13 for 10 (10, jack, queen, king)
+card_probability = np.array([0.] + [1 / 13] * 9 + [4 / 13])
+
+# Distribution of the dealer's final sum for each showing card
+dealer_final_distribution = compute_dealer_final_distribution()
+
+# Transitions of the player's hand when he hits
+player_transitions, player_bust_probability = compute_player_transitions()
+
+# Expected rewards of sticking
+stick_rewards = compute_stick_rewards()
+
+# endregion Fields
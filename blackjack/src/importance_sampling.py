@@ -0,0 +1,118 @@
+import numpy as np
+
+from .black_jack import stick
+from .batch_black_jack import play_batch, target_policy_table, behavior_off_policy_table
+
+# region Functions
+
+def importance_sampling_ratios(states, actions, offsets, target_policy=target_policy_table, behavior_policy=behavior_off_policy_table):
+    # region Summary
+    """
+    Importance-sampling ratios of a batch of episodes, computed from table-driven target and behavior probabilities.
+    :param states: (steps, 3) states of the trajectories (usable ace, sum of player's cards, dealer's card), as returned by play_batch()
+    :param actions: (steps,) actions of the trajectories
+    :param offsets: (episodes + 1,) offsets of the episodes in states and actions
+    :param target_policy: (2, 22, 11) table of probabilities of sticking of the target policy (denoted as 𝜋)
+    :param behavior_policy: (2, 22, 11) table of probabilities of sticking of the behavior policy (denoted as 𝑏)
+    :return: (episodes,) ratios 𝜌 = ∏ 𝜋(𝐴_𝑘|𝑆_𝑘) / 𝑏(𝐴_𝑘|𝑆_𝑘)
+    """
+    # endregion Summary
+
+    # region Body
+
+    index = (states[:, 0], states[:, 1], states[:, 2])
+
+    # Probabilities of the taken actions under both policies
+    sticks = actions == stick
+    target_probabilities = np.where(sticks, target_policy[index], 1 - target_policy[index])
+    behavior_probabilities = np.where(sticks, behavior_policy[index], 1 - behavior_policy[index])
+
+    # Multiply the ratios of the steps of every episode (every episode has at least 1 step)
+    return np.multiply.reduceat(target_probabilities / behavior_probabilities, offsets[:-1])
+
+    # endregion Body
+
+class OffPolicyEstimator:
+    # region Constructor
+
+    def __init__(self):
+        # region Summary
+        """
+        Streaming ordinary and weighted importance-sampling estimates. Episodes arrive in batches along the last axis;
+        leading axes (e.g. independent runs) are estimated separately.
+        """
+        # endregion Summary
+
+        # region Body
+
+        # Sum of weighted returns (denoted as ∑ 𝜌𝐺)
+        self.weighted_returns = 0.0
+
+        # Sum of importance-sampling ratios (denoted as ∑ 𝜌)
+        self.ratios = 0.0
+
+        # Number of episodes
+        self.episodes = 0
+
+        # endregion Body
+
+    # endregion Constructor
+
+    # region Functions
+
+    def update(self, ratios, returns):
+        # region Summary
+        """
+        Add a batch of episodes and get the running estimates after each of them.
+        :param ratios: (..., episodes) importance-sampling ratios
+        :param returns: (..., episodes) returns
+        :return: (..., episodes) ordinary importance sampling and weighted importance sampling estimates
+        """
+        # endregion Summary
+
+        # region Body
+
+        # Running sums, continued from the previous batches
+        weighted_returns = np.expand_dims(self.weighted_returns, -1) + np.cumsum(ratios * returns, axis=-1)
+        cumulative_ratios = np.expand_dims(self.ratios, -1) + np.cumsum(ratios, axis=-1)
+        episodes = self.episodes + np.arange(1, np.shape(ratios)[-1] + 1)
+
+        # Ordinary importance sampling averages the weighted returns over episodes
+        ordinary_estimates = weighted_returns / episodes
+
+        # Weighted importance sampling averages them over ratios (0 while all ratios are 0)
+        weighted_estimates = np.divide(weighted_returns, cumulative_ratios, out=np.zeros(np.shape(weighted_returns)), where=cumulative_ratios != 0)
+
+        self.weighted_returns = weighted_returns[..., -1]
+        self.ratios = cumulative_ratios[..., -1]
+        self.episodes = episodes[-1]
+
+        return ordinary_estimates, weighted_estimates
+
+        # endregion Body
+
+    # endregion Functions
+
+def monte_carlo_off_policy_batch(episodes, runs=1, initial_state=(True, 13, 2), random_generator=None):
+    # region Summary
+    """
+    Monte Carlo Off-Policy Sampling of several independent runs in a single batch.
+    :param episodes: Number of episodes of every run
+    :param runs: Number of independent runs
+    :param initial_state: Whether player has a usable ace, sum of player's cards, 1 card of dealer
+    :param random_generator: np.random.Generator (a fresh one, if None)
+    :return: (runs, episodes) ordinary importance sampling and weighted importance sampling estimates
+    """
+    # endregion Summary
+
+    # region Body
+
+    _, rewards, states, actions, offsets = play_batch(runs * episodes, behavior_off_policy_table, initial_state, random_generator=random_generator)
+
+    ratios = importance_sampling_ratios(states, actions, offsets)
+
+    return OffPolicyEstimator().update(ratios.reshape(runs, episodes), rewards.reshape(runs, episodes))
+
+    # endregion Body
+
+# endregion Functions
@@ -0,0 +1,241 @@
+import os
+import tempfile
+
+import numpy as np
+
+from .black_jack import hit, stick
+from .batch_black_jack import play_batch, play_exploring_starts, target_policy_table
+
+class MonteCarloAccumulator:
+    # region Constructor
+
+    def __init__(self):
+        # region Summary
+        """
+        Incremental Monte Carlo estimator of Blackjack state-action values: owns the sums of returns and the counts of visits of
+        every state-action pair, indexed by [player_sum - 12, dealer_card - 1, usable_ace, action] as in monte_carlo_es().
+        Sums and counts are integers, so accumulators merge exactly in any order.
+        """
+        # endregion Summary
+
+        # region Body
+
+        # Sums of returns of state-action pairs
+        self.returns = np.zeros((10, 10, 2, 2), dtype=np.int64)
+
+        # Counts of visits of state-action pairs
+        self.counts = np.zeros((10, 10, 2, 2), dtype=np.int64)
+
+        # Number of episodes accumulated
+        self.episodes = 0
+
+        # endregion Body
+
+    # endregion Constructor
+
+    # region Functions
+
+    def update(self, batch_of_episodes):
+        # region Summary
+        """
+        Accumulate the returns of a batch of episodes. A hand never comes back to a state it has left (sums only grow, and a usable ace
+        is never regained), so every visit of a state-action pair within an episode is its 1st visit.
+        :param batch_of_episodes: Initial states, rewards, states, actions and offsets, as returned by play_batch()
+        :return: self
+        """
+        # endregion Summary
+
+        # region Body
+
+        _, rewards, states, actions, offsets = batch_of_episodes
+
+        # Every state-action pair of an episode receives the episode's reward
+        step_rewards = np.repeat(rewards, np.diff(offsets))
+
+        # Flat index of every state-action pair
+        indices = np.ravel_multi_index((states[:, 1] - 12, states[:, 2] - 1, states[:, 0], actions), self.counts.shape)
+
+        self.returns += np.bincount(indices, weights=step_rewards, minlength=self.counts.size).astype(np.int64).reshape(self.counts.shape)
+        self.counts += np.bincount(indices, minlength=self.counts.size).reshape(self.counts.shape)
+        self.episodes += len(rewards)
+
+        return self
+
+        # endregion Body
+
+    def merge(self, other):
+        # region Summary
+        """
+        Merge the sums and counts of another accumulator (e.g. produced by another worker) into this one.
+        :param other: MonteCarloAccumulator
+        :return: self
+        """
+        # endregion Summary
+
+        # region Body
+
+        self.returns += other.returns
+        self.counts += other.counts
+        self.episodes += other.episodes
+
+        return self
+
+        # endregion Body
+
+    def state_action_values(self):
+        # region Summary
+        """
+        Sample-average of returns of state-action pairs (0 for pairs never visited).
+        :return: (10, 10, 2, 2) state-action values
+        """
+        # endregion Summary
+
+        # region Body
+
+        return np.divide(self.returns, self.counts, out=np.zeros(self.counts.shape), where=self.counts > 0)
+
+        # endregion Body
+
+    def state_values(self):
+        # region Summary
+        """
+        Sample-average of returns of states, over all actions taken in them (as monte_carlo_on_policy()).
+        :return: Values of states with usable ace, values of states with no usable ace, indexed by [player_sum - 12, dealer_card - 1]
+        """
+        # endregion Summary
+
+        # region Body
+
+        returns = self.returns.sum(axis=-1)
+        counts = self.counts.sum(axis=-1)
+        values = np.divide(returns, counts, out=np.zeros(counts.shape), where=counts > 0)
+
+        return values[:, :, 1], values[:, :, 0]
+
+        # endregion Body
+
+    def greedy_policy(self):
+        # region Summary
+        """
+        Greedy policy with respect to the current state-action values, ties being broken randomly (as behavior_policy of monte_carlo_es()).
+        :return: (2, 22, 11) table of probabilities of sticking, indexed by [usable_ace, player_sum, dealer_card]
+        """
+        # endregion Summary
+
+        # region Body
+
+        values = self.state_action_values()
+
+        # Stick, if sticking is better; hit, if hitting is better; either with equal probability, if they are equal
+        stick_probability = np.where(values[..., stick] > values[..., hit], 1.0, np.where(values[..., stick] < values[..., hit], 0.0, 0.5))
+
+        table = np.zeros((2, 22, 11))
+        table[:, 12:22, 1:] = stick_probability.transpose(2, 0, 1)
+
+        return table
+
+        # endregion Body
+
+    def simulate(self, episodes, policy_player=target_policy_table, exploring_starts: bool = False, chunk_size: int = 100000,
+                 random_generator=None, checkpoint_path=None):
+        # region Summary
+        """
+        Play and accumulate episodes in chunks.
+        :param episodes: Number of episodes
+        :param policy_player: (2, 22, 11) table of probabilities of sticking (with exploring starts: policy of the 1st chunk of a new accumulator)
+        :param exploring_starts: If True, use random initial states and actions, and follow the greedy policy of the current values (Monte Carlo ES)
+        :param chunk_size: Number of episodes played at once (with exploring starts, the policy is updated after every chunk)
+        :param random_generator: np.random.Generator (a fresh one, if None)
+        :param checkpoint_path: If not None, save a snapshot to this path after every chunk
+        :return: self
+        """
+        # endregion Summary
+
+        # region Body
+
+        random_generator = np.random.default_rng() if random_generator is None else random_generator
+
+        for start in range(0, episodes, chunk_size):
+            size = min(chunk_size, episodes - start)
+
+            if exploring_starts:
+                # follow the greedy policy of the current values (the given policy, until any episode has been accumulated)
+                policy = self.greedy_policy() if self.episodes else policy_player
+
+                self.update(play_exploring_starts(size, policy, random_generator))
+            else:
+                self.update(play_batch(size, policy_player, random_generator=random_generator))
+
+            if checkpoint_path is not None:
+                self.save(checkpoint_path)
+
+        return self
+
+        # endregion Body
+
+    def save(self, path):
+        # region Summary
+        """
+        Save a snapshot of the accumulator to a compressed .npz file. The snapshot is written to a temporary file in the same
+        directory, then renamed over the previous one, so an interrupted save never corrupts it.
+        :param path: Path of the file (.npz is appended, if missing)
+        """
+        # endregion Summary
+
+        # region Body
+
+        path = get_snapshot_path(path)
+
+        file_descriptor, temporary_path = tempfile.mkstemp(suffix='.npz', dir=os.path.dirname(os.path.abspath(path)))
+        try:
+            with os.fdopen(file_descriptor, 'wb') as f:
+                np.savez_compressed(f, returns=self.returns, counts=self.counts, episodes=self.episodes)
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+        # endregion Body
+
+    @classmethod
+    def load(cls, path):
+        # region Summary
+        """
+        Restore an accumulator from a snapshot.
+        :param path: Path of the .npz file (.npz is appended, if missing, as by save())
+        :return: MonteCarloAccumulator
+        """
+        # endregion Summary
+
+        # region Body
+
+        accumulator = cls()
+
+        with np.load(get_snapshot_path(path)) as snapshot:
+            accumulator.returns = snapshot['returns'].astype(np.int64)
+            accumulator.counts = snapshot['counts'].astype(np.int64)
+            accumulator.episodes = int(snapshot['episodes'])
+
+        return accumulator
+
+        # endregion Body
+
+    # endregion Functions
+
+
+def get_snapshot_path(path):
+    # region Summary
+    """
+    Get the path of a snapshot file, with the .npz suffix that np.savez_compressed() would append.
+    :param path: Path of the snapshot, with or without .npz
+    :return: Path ending in .npz
+    """
+    # endregion Summary
+
+    # region Body
+
+    path = os.fspath(path)
+
+    return path if path.endswith('.npz') else path + '.npz'
+
+    # endregion Body
@@ -0,0 +1,146 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import RawArray
+
+import numpy as np
+
+from .batch_black_jack import play_exploring_starts, target_policy_table
+from .black_jack_dp import optimal_policy
+from .monte_carlo_accumulator import MonteCarloAccumulator
+
+# region Fields
+
+# Shape of policy tables: [usable_ace, player_sum, dealer_card]
+policy_shape = (2, 22, 11)
+
+# Worker's view of the policy shared by the coordinator (set by initialize_worker())
+shared_policy = None
+
+# endregion Fields
+
+# region Functions
+
+# region Worker
+
+def initialize_worker(policy_buffer):
+    # region Summary
+    """
+    Map the shared policy buffer into a worker process.
+    :param policy_buffer: multiprocessing.RawArray holding the policy table
+    """
+    # endregion Summary
+
+    # region Body
+
+    global shared_policy
+    shared_policy = np.frombuffer(policy_buffer, dtype=np.float64).reshape(policy_shape)
+
+    # endregion Body
+
+def play_block(episodes, seed_sequence):
+    # region Summary
+    """
+    Play a block of exploring-start episodes against a snapshot of the shared policy.
+    :param episodes: Number of episodes
+    :param seed_sequence: np.random.SeedSequence of the block
+    :return: MonteCarloAccumulator holding the block's returns and counts
+    """
+    # endregion Summary
+
+    # region Body
+
+    # Take a snapshot of the policy: the coordinator only rewrites it between rounds, when no block is running
+    policy = shared_policy.copy()
+
+    return MonteCarloAccumulator().update(play_exploring_starts(episodes, policy, np.random.default_rng(seed_sequence)))
+
+    # endregion Body
+
+# endregion Worker
+
+# region Coordinator
+
+def monte_carlo_es_parallel(episodes, workers=None, sync_interval: int = 50000, seed=None):
+    # region Summary
+    """
+    Monte Carlo with Exploring Starts (ES) on a process pool. In every round, each worker plays a block of sync_interval episodes
+    against the greedy policy shared through shared memory; the coordinator then merges the blocks' returns and counts into the
+    master accumulator and re-broadcasts the new greedy policy.
+    :param episodes: Number of episodes
+    :param workers: Number of worker processes (os.cpu_count(), if None)
+    :param sync_interval: Number of episodes each worker plays between policy syncs
+    :param seed: Seed of the root np.random.SeedSequence (fresh entropy, if None)
+    :return: MonteCarloAccumulator with the merged returns and counts
+    """
+    # endregion Summary
+
+    # region Body
+
+    workers = os.cpu_count() if workers is None else workers
+
+    # Split the episodes into blocks; every round plays 1 block per worker
+    block_sizes = [min(sync_interval, episodes - start) for start in range(0, episodes, sync_interval)]
+    seed_sequences = np.random.SeedSequence(seed).spawn(len(block_sizes))
+
+    # Shared memory for the policy, starting with the target policy (as the 1st episode of monte_carlo_es())
+    policy_buffer = RawArray('d', int(np.prod(policy_shape)))
+    policy = np.frombuffer(policy_buffer, dtype=np.float64).reshape(policy_shape)
+    policy[:] = target_policy_table
+
+    accumulator = MonteCarloAccumulator()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=initialize_worker, initargs=(policy_buffer,)) as executor:
+        for start in range(0, len(block_sizes), workers):
+            # play 1 round of blocks
+            round_blocks = executor.map(play_block, block_sizes[start:start + workers], seed_sequences[start:start + workers])
+
+            # merge the blocks' deltas in block order
+            for block in round_blocks:
+                accumulator.merge(block)
+
+            # re-broadcast the greedy policy
+            policy[:] = accumulator.greedy_policy()
+
+    return accumulator
+
+    # endregion Body
+
+def sync_interval_study(episodes, sync_intervals, workers=None, seed=None):
+    # region Summary
+    """
+    Report the tradeoff between sync interval, wall-clock time and the quality of the final (Figure 5.2) policy.
+    :param episodes: Number of episodes of every run
+    :param sync_intervals: Sync intervals to compare
+    :param workers: Number of worker processes (os.cpu_count(), if None)
+    :param seed: Seed shared by all runs
+    :return: List of rows: sync interval, wall-clock seconds, fraction of states whose greedy action is optimal and
+             mean absolute error of the greedy action's value with respect to the exact optimal values
+    """
+    # endregion Summary
+
+    # region Body
+
+    # Exact optimal actions and values (from dynamic programming)
+    optimal_actions, optimal_values = optimal_policy()
+
+    rows = []
+
+    for sync_interval in sync_intervals:
+        start_time = time.perf_counter()
+        accumulator = monte_carlo_es_parallel(episodes, workers, sync_interval, seed)
+        seconds = time.perf_counter() - start_time
+
+        state_action_values = accumulator.state_action_values()
+
+        rows.append(dict(sync_interval=sync_interval, seconds=seconds,
+                         policy_agreement=np.mean(np.argmax(state_action_values, axis=-1) == optimal_actions),
+                         value_error=np.mean(np.abs(np.max(state_action_values, axis=-1) - optimal_values))))
+
+    return rows
+
+    # endregion Body
+
+# endregion Coordinator
+
+# endregion Functions
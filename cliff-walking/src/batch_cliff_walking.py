@@ -0,0 +1,235 @@
+import numpy as np
+
+from .cliff_walking import world, start, goal, actions, discount, exploration_probability, step_size, step
+
+# region Functions
+
+def build_transition_table():
+    # region Summary
+    """
+    Tabulate step() for every state and action. States are numbered i * width + j.
+    :return: (48, 4) next states, (48, 4) rewards
+    """
+    # endregion Summary
+
+    # region Body
+
+    next_states = np.zeros((world["height"] * world["width"], len(actions)), dtype=np.int64)
+    rewards = np.zeros((world["height"] * world["width"], len(actions)))
+
+    for i in range(world["height"]):
+        for j in range(world["width"]):
+            for action in actions:
+                next_state, reward = step([i, j], action)
+                next_states[i * world["width"] + j, action] = next_state[0] * world["width"] + next_state[1]
+                rewards[i * world["width"] + j, action] = reward
+
+    return next_states, rewards
+
+    # endregion Body
+
+# Next states and rewards of every state and action
+next_state_table, reward_table = build_transition_table()
+
+# Start and goal states' numbers
+start_state = start[0] * world["width"] + start[1]
+goal_state = goal[0] * world["width"] + goal[1]
+
+def greedy_mask(values):
+    # region Summary
+    """
+    Get the greedy actions of a batch of action-value estimates.
+    :param values: (n, 4) action-value estimates
+    :return: (n, 4) True for the actions with the highest estimated value
+    """
+    # endregion Summary
+
+    # region Body
+
+    return values == values.max(axis=1, keepdims=True)
+
+    # endregion Body
+
+def choose_actions(values, random_generator):
+    # region Summary
+    """
+    Choose actions of a batch of runs based on 𝜀-greedy algorithm (vectorized choose_action()).
+    :param values: (n, 4) action-value estimates of the runs' current states
+    :param random_generator: np.random.Generator
+    :return: (n,) actions
+    """
+    # endregion Summary
+
+    # region Body
+
+    # ε-greedy action selection: with probability ε, select randomly from among all the actions; otherwise, select randomly from
+    # among the greedy actions
+    explore = random_generator.random(len(values)) < exploration_probability
+    candidates = explore[:, None] | greedy_mask(values)
+
+    # The candidate with the greatest random key is a uniform choice among the candidates
+    return np.argmax(np.where(candidates, random_generator.random(values.shape), -1), axis=1)
+
+    # endregion Body
+
+def expected_values(values):
+    # region Summary
+    """
+    Get the expected action-value estimates under the 𝜀-greedy policy (the target of Expected SARSA, Equation (6.9)).
+    :param values: (n, 4) action-value estimates
+    :return: (n,) expected values
+    """
+    # endregion Summary
+
+    # region Body
+
+    greedy = greedy_mask(values)
+
+    # Greedy actions share the probability 1 − ε; every action gets ε / |A|
+    probabilities = exploration_probability / len(actions) + greedy * (1.0 - exploration_probability) / greedy.sum(axis=1, keepdims=True)
+
+    return np.sum(probabilities * values, axis=1)
+
+    # endregion Body
+
+def run_episodes(method, episodes, runs, step_sizes=step_size, random_generator=None):
+    # region Summary
+    """
+    Run episodes of several independent runs at once: all runs step concurrently, every run starting its next episode as soon as
+    it reaches the goal (runs that finished all their episodes are masked out).
+    :param method: 'sarsa', 'expected_sarsa' or 'q_learning'
+    :param episodes: Number of episodes of each run
+    :param runs: Number of independent runs
+    :param step_sizes: Step-size parameter (denoted as 𝛼): 1 for all runs or (runs,) step sizes
+    :param random_generator: np.random.Generator (a fresh one, if None)
+    :return: (runs, episodes) total rewards of every episode, (runs, 4, 12, 4) action-value estimates (denoted as 𝑄(𝑆_𝑡, 𝐴_𝑡))
+    """
+    # endregion Summary
+
+    # region Body
+
+    random_generator = np.random.default_rng() if random_generator is None else random_generator
+
+    step_sizes = np.broadcast_to(np.asarray(step_sizes, dtype=float), (runs,))
+
+    action_value_estimates = np.zeros((runs, world["height"], world["width"], len(actions)))
+    rewards = np.zeros((runs, episodes))
+
+    # View of the estimates with 1 row per run and state: row run * 48 + state
+    n_states = world["height"] * world["width"]
+    values = action_value_estimates.reshape(runs * n_states, len(actions))
+
+    # Initialize all runs' states at the start, in their 1st episode
+    running = np.arange(runs)
+    states = np.full(runs, start_state)
+    episode_numbers = np.zeros(runs, dtype=np.int64)
+    run_step_sizes = step_sizes.copy()
+
+    # Choose the 1st actions (SARSA and Expected SARSA choose the next action before updating)
+    if method != 'q_learning':
+        next_actions = choose_actions(values[running * n_states + states], random_generator)
+
+    while running.size:
+        rows = running * n_states + states
+
+        # choose the actions of the running runs
+        if method == 'q_learning':
+            current_actions = choose_actions(values[rows], random_generator)
+        else:
+            current_actions = next_actions
+
+        # get the next states and rewards
+        next_states = next_state_table[states, current_actions]
+        step_rewards = reward_table[states, current_actions]
+        rewards[running, episode_numbers] += step_rewards
+
+        # form the targets: Equation (6.7) for SARSA, (6.9) for Expected SARSA, (6.8) for Q-learning
+        next_values = values[running * n_states + next_states]
+        if method == 'sarsa':
+            next_actions = choose_actions(next_values, random_generator)
+            targets = next_values[np.arange(running.size), next_actions]
+        elif method == 'expected_sarsa':
+            next_actions = choose_actions(next_values, random_generator)
+            targets = expected_values(next_values)
+        else:
+            targets = next_values.max(axis=1)
+
+        # update action-value estimates
+        values[rows, current_actions] += run_step_sizes * (step_rewards + discount * targets - values[rows, current_actions])
+
+        states = next_states
+
+        # runs that reached the goal start their next episode at the start
+        reached_goal = states == goal_state
+        if reached_goal.any():
+            episode_numbers[reached_goal] += 1
+            states[reached_goal] = start_state
+            if method != 'q_learning':
+                next_actions[reached_goal] = choose_actions(values[running[reached_goal] * n_states + start_state], random_generator)
+
+            # mask out the runs that finished all their episodes
+            going_on = episode_numbers < episodes
+            if not going_on.all():
+                running, states, episode_numbers, run_step_sizes = running[going_on], states[going_on], episode_numbers[going_on], run_step_sizes[going_on]
+                if method != 'q_learning':
+                    next_actions = next_actions[going_on]
+
+    return rewards, action_value_estimates
+
+    # endregion Body
+
+def example_6_6(runs=50, episodes=500, random_generator=None):
+    # region Summary
+    """
+    Reproduce Example 6.6: sum of rewards during episodes of SARSA and Q-learning, averaged over runs.
+    :param runs: Number of independent runs
+    :param episodes: Number of episodes of each run
+    :param random_generator: np.random.Generator (a fresh one, if None)
+    :return: (episodes,) SARSA rewards, (episodes,) Q-learning rewards, (runs, 4, 12, 4) SARSA and Q-learning estimates
+    """
+    # endregion Summary
+
+    # region Body
+
+    random_generator = np.random.default_rng() if random_generator is None else random_generator
+
+    rewards_sarsa, sarsa_estimates = run_episodes('sarsa', episodes, runs, random_generator=random_generator)
+    rewards_q_learning, q_learning_estimates = run_episodes('q_learning', episodes, runs, random_generator=random_generator)
+
+    return rewards_sarsa.mean(axis=0), rewards_q_learning.mean(axis=0), sarsa_estimates, q_learning_estimates
+
+    # endregion Body
+
+def figure_6_3(runs=50, episodes=1000, step_sizes=np.arange(0.1, 1.1, 0.1), interim_episodes=100, random_generator=None):
+    # region Summary
+    """
+    Reproduce Figure 6.3: all step sizes are stacked into 1 batch of runs for every method.
+    :param runs: Number of independent runs of every step size
+    :param episodes: Number of episodes of each run
+    :param step_sizes: Step-size parameters (denoted as 𝛼)
+    :param interim_episodes: Number of the first episodes averaged for the interim performance
+    :param random_generator: np.random.Generator (a fresh one, if None)
+    :return: (6, len(step_sizes)) asymptotic performance of SARSA, Expected SARSA and Q-learning, then their interim performance
+    """
+    # endregion Summary
+
+    # region Body
+
+    random_generator = np.random.default_rng() if random_generator is None else random_generator
+
+    performance = np.zeros((6, len(step_sizes)))
+
+    for index, method in enumerate(['sarsa', 'expected_sarsa', 'q_learning']):
+        # Runs of step size k are rows k * runs ... (k + 1) * runs - 1
+        rewards, _ = run_episodes(method, episodes, runs * len(step_sizes), np.repeat(step_sizes, runs), random_generator)
+        rewards = rewards.reshape(len(step_sizes), runs, episodes)
+
+        # Asymptotic performance is an average over all episodes; interim performance over the first episodes
+        performance[index] = rewards.mean(axis=(1, 2))
+        performance[3 + index] = rewards[:, :, :interim_episodes].mean(axis=(1, 2))
+
+    return performance
+
+    # endregion Body
+
+# endregion Functions
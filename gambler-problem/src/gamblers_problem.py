@@ -0,0 +1,216 @@
+import numpy as np
+
+# region Fields
+
+# Goal
+goal = 100
+
+# Probability of the coin coming up heads (denoted as p_h)
+head_probability = 0.4
+
+# Algorithm parameter: a small threshold determining accuracy of estimation (denoted as 𝜃 > 0)
+estimation_accuracy = 1e-9
+
+# Largest number of (stake, state) pairs of the index matrix: goals up to about 1000 are evaluated with 1 index matrix,
+# larger goals (for which the gathers cost more than a loop over stakes) 1 band of states per stake
+max_elements = 5 * 10 ** 5
+
+# endregion Fields
+
+# region Functions
+
+def get_stake_matrix(goal=goal):
+    # region Summary
+    """
+    Get the index matrices of the returns of all (stake, state) pairs.
+    Rows are stakes a ∈ {1, 2, ..., goal // 2} and columns are the non-terminal states s ∈ 𝒮 = {1, 2, ..., goal - 1}.
+    :param goal: Goal
+    :return: (stakes, goal - 1) states reached on heads s + a, states reached on tails s − a, True where a ≤ min(s, goal − s)
+    """
+    # endregion Summary
+
+    # region Body
+
+    states = np.arange(1, goal)
+    stakes = np.arange(1, goal // 2 + 1)[:, None]
+
+    # Stakes larger than min(s, goal − s) are not allowed: their indices are clipped and their returns masked
+    allowed = stakes <= np.minimum(states, goal - states)
+    heads = np.minimum(states + stakes, goal)
+    tails = np.maximum(states - stakes, 0)
+
+    return heads, tails, allowed
+
+    # endregion Body
+
+def get_action_returns(state_value, stake_matrix, head_probability=head_probability):
+    # region Summary
+    """
+    Compute the returns of all (stake, state) pairs in 1 expression.
+    :param state_value: state-value function (denoted as V(s), ∀s ∈ 𝒮^+)
+    :param stake_matrix: (heads, tails, allowed), see get_stake_matrix()
+    :param head_probability: Probability of the coin coming up heads (denoted as p_h)
+    :return: (stakes, goal - 1) returns, −∞ for the stakes not allowed
+    """
+    # endregion Summary
+
+    # region Body
+
+    heads, tails, allowed = stake_matrix
+
+    # Return of staking a in state s: p_h V(s + a) + (1 − p_h) V(s − a)
+    return np.where(allowed, head_probability * state_value[heads] + (1.0 - head_probability) * state_value[tails], -np.inf)
+
+    # endregion Body
+
+def get_band_returns(state_value, stake, head_probability=head_probability, out=None):
+    # region Summary
+    """
+    Compute the returns of a stake in the band of states that allow it, s ∈ {stake, ..., goal − stake}, from 2 slices.
+    :param state_value: state-value function (denoted as V(s), ∀s ∈ 𝒮^+)
+    :param stake: stake (denoted as a)
+    :param head_probability: Probability of the coin coming up heads (denoted as p_h)
+    :param out: buffer of at least goal - 1 returns (a new array, if None)
+    :return: (goal − 2 stake + 1,) returns, a view of out
+    """
+    # endregion Summary
+
+    # region Body
+
+    goal = len(state_value) - 1
+    out = np.zeros(goal - 1) if out is None else out
+    returns = out[:goal - 2 * stake + 1]
+
+    # p_h V(s + a) + (1 − p_h) V(s − a), ∀s ∈ {a, ..., goal − a}
+    np.multiply(state_value[2 * stake:], head_probability, out=returns)
+    returns += (1.0 - head_probability) * state_value[:goal - 2 * stake + 1]
+
+    return returns
+
+    # endregion Body
+
+def get_best_returns(state_value, head_probability=head_probability, stake_matrix=None):
+    # region Summary
+    """
+    Compute the best return over the positive stakes of every non-terminal state.
+    :param state_value: state-value function (denoted as V(s), ∀s ∈ 𝒮^+)
+    :param head_probability: Probability of the coin coming up heads (denoted as p_h)
+    :param stake_matrix: (heads, tails, allowed), see get_stake_matrix() (the returns are computed band by band, if None)
+    :return: (goal - 1,) best returns
+    """
+    # endregion Summary
+
+    # region Body
+
+    if stake_matrix is not None:
+        return get_action_returns(state_value, stake_matrix, head_probability).max(axis=0)
+
+    goal = len(state_value) - 1
+    best_returns = np.full(goal - 1, -np.inf)
+    buffer = np.zeros(goal - 1)
+
+    for stake in range(1, goal // 2 + 1):
+        # The band of states allowing the stake: s ∈ {a, ..., goal − a}, at indices s − 1
+        band = best_returns[stake - 1:goal - stake]
+        np.maximum(band, get_band_returns(state_value, stake, head_probability, buffer), out=band)
+
+    return best_returns
+
+    # endregion Body
+
+def get_policy(state_value, head_probability=head_probability, tolerance=1e-6, stake_matrix=None):
+    # region Summary
+    """
+    Get the greedy policy of a state-value function: the smallest positive stake whose return is within tolerance of the best one
+    (deterministic, where the argmax over returns rounded to 5 decimals depends on rounding).
+    :param state_value: state-value function (denoted as V(s), ∀s ∈ 𝒮^+)
+    :param head_probability: Probability of the coin coming up heads (denoted as p_h)
+    :param tolerance: stakes whose return is within this of the best return count as ties
+    :param stake_matrix: (heads, tails, allowed), see get_stake_matrix() (the returns are computed band by band, if None)
+    :return: policy (goal + 1,) stakes, 0 in the terminal states
+    """
+    # endregion Summary
+
+    # region Body
+
+    goal = len(state_value) - 1
+    best_returns = get_best_returns(state_value, head_probability, stake_matrix)
+
+    policy = np.zeros(goal + 1, dtype=np.int64)
+
+    if stake_matrix is not None:
+        # The 1st tie of every column is its smallest stake
+        ties = get_action_returns(state_value, stake_matrix, head_probability) >= best_returns - tolerance
+        policy[1:goal] = np.argmax(ties, axis=0) + 1
+        return policy
+
+    buffer = np.zeros(goal - 1)
+
+    # The stakes come in increasing order, so the 1st tie found in a state is its smallest one
+    for stake in range(1, goal // 2 + 1):
+        band = policy[stake:goal - stake + 1]
+        ties = get_band_returns(state_value, stake, head_probability, buffer) >= best_returns[stake - 1:goal - stake] - tolerance
+        band[(band == 0) & ties] = stake
+
+    return policy
+
+    # endregion Body
+
+def value_iteration(goal=goal, head_probability=head_probability, estimation_accuracy=estimation_accuracy, history_every=None,
+                    tolerance=1e-6):
+    # region Summary
+    """
+    Value iteration for the gambler's problem (Figure 4.3), every sweep evaluating all stakes of all states at once.
+    The sweeps are synchronous, so they take more iterations than the in-place sweeps of the notebook.
+    :param goal: Goal (at least 2, so that there is a non-terminal state)
+    :param head_probability: Probability of the coin coming up heads (denoted as p_h)
+    :param estimation_accuracy: Algorithm parameter: a small threshold determining accuracy of estimation (denoted as 𝜃 > 0)
+    :param history_every: record the state-value function of every history_every-th sweep, and the final one (no history, if None)
+    :param tolerance: stakes whose return is within this of the best return count as ties, the smallest of them being chosen,
+                      so that the policy does not depend on rounding errors
+    :return: state-value function (goal + 1,), policy (goal + 1,) stakes, history of sweeps (list), number of sweeps
+    """
+    # endregion Summary
+
+    # region Body
+
+    # With a goal below 2, there is no non-terminal state (s ∈ {1, ..., goal − 1}) to sweep
+    if goal < 2:
+        raise ValueError('Goal must be at least 2: %s' % goal)
+
+    # Initialize state-value function (denoted as V(s), ∀s ∈ 𝒮^+), arbitrarily except that V(terminal state) = 0
+    state_value = np.zeros(goal + 1)
+    state_value[goal] = 1.0
+
+    # History of sweeps
+    sweeps_history = []
+
+    # Goals whose pairs fit in max_elements get 1 index matrix; larger goals are evaluated band by band
+    stake_matrix = get_stake_matrix(goal) if (goal - 1) * (goal // 2) <= max_elements else None
+
+    sweep = 0
+    while True:
+        if history_every is not None and sweep % history_every == 0:
+            sweeps_history.append(state_value.copy())
+
+        # Stake 0 keeps the capital, so the new value is never below the old one
+        new_state_value = np.maximum(state_value[1:goal], get_best_returns(state_value, head_probability, stake_matrix))
+
+        # Value function change in a sweep (denoted as ∆)
+        value_function_change = np.max(np.abs(new_state_value - state_value[1:goal]))
+        state_value[1:goal] = new_state_value
+
+        sweep += 1
+
+        # Stop once the value function changes by only a small amount in a sweep
+        if value_function_change < estimation_accuracy:
+            break
+
+    if history_every is not None:
+        sweeps_history.append(state_value.copy())
+
+    return state_value, get_policy(state_value, head_probability, tolerance, stake_matrix), sweeps_history, sweep
+
+    # endregion Body
+
+# endregion Functions
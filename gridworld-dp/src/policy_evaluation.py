@@ -0,0 +1,132 @@
+import numpy as np
+
+from .grid_world import grid_size, actions, action_probability
+
+# region Functions
+
+def get_model(grid_size=grid_size):
+    # region Summary
+    """
+    Tabulate step() for every state and action of a gridworld of any size. States are numbered i * grid_size + j.
+    :param grid_size: Size of rectangular (square) gridworld
+    :return: (4, grid_size²) next states (denoted as 𝑠′) of every action and state, (grid_size²,) rewards (denoted as 𝑟), the same
+             for all actions
+    """
+    # endregion Summary
+
+    # region Body
+
+    i, j = np.divmod(np.arange(grid_size * grid_size), grid_size)
+
+    # The terminal states are at the vertices of the main diagonal
+    terminal = ((i == 0) & (j == 0)) | ((i == grid_size - 1) & (j == grid_size - 1))
+
+    next_states = np.zeros((len(actions), grid_size * grid_size), dtype=np.int32)
+    for a, action in enumerate(actions):
+        # Actions that would take the agent off the grid leave its location unchanged
+        next_i = np.clip(i + action[0], 0, grid_size - 1)
+        next_j = np.clip(j + action[1], 0, grid_size - 1)
+
+        # The terminal states are never left
+        next_states[a] = np.where(terminal, i * grid_size + j, next_i * grid_size + next_j)
+
+    # The reward is -1 on all transitions until the terminal state is reached
+    rewards = np.where(terminal, 0.0, -1.0)
+
+    return next_states, rewards
+
+    # endregion Body
+
+def get_blocks(grid_size=grid_size, order='row_major'):
+    # region Summary
+    """
+    Get the blocks of states updated one after another by an in-place sweep (the states of a block are updated at once).
+    :param grid_size: Size of rectangular (square) gridworld
+    :param order: 'row_major': the anti-diagonals i + j = 0, 1, ..., 2 * grid_size - 2, which gives exactly the values of updating
+                  the states one by one in row-major order (a state depends only on its left and upper neighbours, already updated,
+                  and its right and lower neighbours, not yet updated);
+                  'checkerboard': the states with an even i + j, then those with an odd i + j (no neighbours in the same block);
+                  otherwise, a list of arrays of states (numbered i * grid_size + j)
+    :return: list of arrays of states
+    """
+    # endregion Summary
+
+    # region Body
+
+    if not isinstance(order, str):
+        return [np.asarray(block, dtype=np.int64) for block in order]
+
+    states = np.arange(grid_size * grid_size)
+    diagonals = states // grid_size + states % grid_size
+
+    if order == 'row_major':
+        # Sort the states by anti-diagonal once, then split them at the diagonal boundaries
+        sorted_states = states[np.argsort(diagonals, kind='stable')]
+        return np.split(sorted_states, np.cumsum(np.bincount(diagonals))[:-1])
+
+    if order == 'checkerboard':
+        return [states[diagonals % 2 == 0], states[diagonals % 2 == 1]]
+
+    raise ValueError('Unknown order: %s' % order)
+
+    # endregion Body
+
+def evaluate_policy(grid_size=grid_size, in_place=True, discount=1.0, threshold=1e-4, order='row_major'):
+    # region Summary
+    """
+    Compute state-value of the equiprobable random policy, every sweep being a gather over the precomputed next states
+    (vectorized compute_state_value(), with the same number of iterations).
+    :param grid_size: Size of rectangular (square) gridworld
+    :param in_place: True to update the values in place, 1 block of states after another (see get_blocks()); otherwise, False
+                     to update all states at once from the old values
+    :param discount: Discount rate (denoted as 0 ≤ 𝛾 ≤ 1)
+    :param threshold: Small threshold determining accuracy of estimation (denoted as 𝜃 > 0)
+    :param order: order of the in-place updates (see get_blocks())
+    :return: New state-values and number of iterations
+    """
+    # endregion Summary
+
+    # region Body
+
+    next_states, rewards = get_model(grid_size)
+
+    # Values of state-value function (denoted as 𝑣_𝑘 (𝑠)), 1 per state
+    state_values = np.zeros(grid_size * grid_size)
+
+    # Next states and rewards of every block, gathered once
+    if in_place:
+        blocks = [(block, next_states[:, block], rewards[block]) for block in get_blocks(grid_size, order)]
+    else:
+        next_values = np.zeros(next_states.shape)
+
+    # Initialize number of iterations
+    iteration = 0
+
+    # Iterate until value convergence
+    while True:
+        old_state_values = state_values.copy()
+
+        if in_place:
+            # Every block sees the values already updated by the previous blocks of the sweep
+            for block, block_next_states, block_rewards in blocks:
+                state_values[block] = np.sum(action_probability * (block_rewards + discount * state_values[block_next_states]), axis=0)
+        else:
+            # Bellman equation for 𝑣_𝜋, all states at once (in the buffer of the next values, so no temporary is allocated)
+            np.take(old_state_values, next_states, out=next_values)
+            next_values *= discount
+            next_values += rewards
+            next_values *= action_probability
+            state_values = next_values.sum(axis=0)
+
+        # Check value convergence
+        if np.abs(old_state_values - state_values).max() < threshold:
+            break
+
+        # Increment number of iterations
+        iteration += 1
+
+    return state_values.reshape(grid_size, grid_size), iteration
+
+    # endregion Body
+
+# endregion Functions
@@ -0,0 +1,140 @@
+import time
+
+import numpy as np
+import scipy.sparse
+import scipy.sparse.linalg
+
+from . import grid_world
+from .grid_world import grid_size, actions, step, get_model
+
+# region Fields
+
+# Suppose the agent selects all 4 actions with equal probability in all states => the probability of each action will be 1/4.
+action_probability = 0.25
+
+# Discount rate (denoted as 0 ≤ 𝛾 ≤ 1)
+discount = 0.9
+
+# Largest number of states solved by the direct sparse factorization when the method is 'auto'
+direct_limit = 100000
+
+# endregion Fields
+
+# region Functions
+
+def get_step_model(grid_size=grid_size):
+    # region Summary
+    """
+    Get the next states and rewards of every state and action: from step() itself, called once for every state and action, for
+    the grid size step() reads, tabulated by get_model() for other sizes.
+    :param grid_size: Size of rectangular (square) gridworld
+    :return: (grid_size², 4) next states (denoted as 𝑠′), (grid_size², 4) rewards (denoted as 𝑟)
+    """
+    # endregion Summary
+
+    # region Body
+
+    if grid_size != grid_world.grid_size:
+        return get_model(grid_size)
+
+    next_states = np.zeros((grid_size * grid_size, len(actions)), dtype=np.int64)
+    rewards = np.zeros((grid_size * grid_size, len(actions)))
+
+    # States are numbered i * grid_size + j
+    for i in range(grid_size):
+        for j in range(grid_size):
+            for a, action in enumerate(actions):
+                next_state, rewards[i * grid_size + j, a] = step([i, j], action)
+                next_states[i * grid_size + j, a] = next_state[0] * grid_size + next_state[1]
+
+    return next_states, rewards
+
+    # endregion Body
+
+def get_linear_system(grid_size=grid_size, discount=discount):
+    # region Summary
+    """
+    Build the Bellman equation for 𝑣_𝜋 of the equiprobable random policy as a linear system (I − 𝛾𝑃)𝑣 = 𝑟 (see get_step_model()).
+    :param grid_size: Size of rectangular (square) gridworld
+    :param discount: Discount rate (denoted as 0 ≤ 𝛾 ≤ 1)
+    :return: (grid_size², grid_size²) scipy.sparse.csr_matrix I − 𝛾𝑃, (grid_size²,) expected rewards 𝑟
+    """
+    # endregion Summary
+
+    # region Body
+
+    next_states, rewards = get_step_model(grid_size)
+    n_states = grid_size * grid_size
+
+    # 𝑃(𝑠, 𝑠′) = ∑_𝑎 𝜋(𝑎|𝑠) 𝑝(𝑠′|𝑠, 𝑎): duplicate entries (e.g. 2 actions off the grid of a corner) are summed
+    transition_matrix = scipy.sparse.csr_matrix((np.full(next_states.size, action_probability),
+                                                 (np.repeat(np.arange(n_states), len(actions)), next_states.ravel())),
+                                                shape=(n_states, n_states))
+
+    # 𝑟(𝑠) = ∑_𝑎 𝜋(𝑎|𝑠) 𝑟(𝑠, 𝑎)
+    expected_rewards = action_probability * rewards.sum(axis=1)
+
+    return (scipy.sparse.identity(n_states, format='csr') - discount * transition_matrix).tocsr(), expected_rewards
+
+    # endregion Body
+
+def solve_state_values(grid_size=grid_size, discount=discount, method='auto', tolerance=1e-10, max_iterations=1000):
+    # region Summary
+    """
+    Compute the state values of the equiprobable random policy (Figure 3.2) by solving (I − 𝛾𝑃)𝑣 = 𝑟 instead of sweeping.
+    :param grid_size: Size of rectangular (square) gridworld
+    :param discount: Discount rate (denoted as 0 ≤ 𝛾 < 1)
+    :param method: 'direct' (sparse LU factorization), 'gmres' or 'bicgstab' (Krylov methods with a Jacobi preconditioner),
+                   or 'auto': 'direct' up to direct_limit states, 'bicgstab' above
+                   (I − 𝛾𝑃 is not symmetric, so conjugate gradient does not apply)
+    :param tolerance: relative tolerance of the Krylov methods
+    :param max_iterations: maximum number of iterations of the Krylov methods
+    :return: (grid_size, grid_size) state values, dictionary with the method, the number of iterations, the residual
+             ‖𝑟 − (I − 𝛾𝑃)𝑣‖_∞ and the times (in seconds) to build and solve the system
+    """
+    # endregion Summary
+
+    # region Body
+
+    if method == 'auto':
+        method = 'direct' if grid_size * grid_size <= direct_limit else 'bicgstab'
+
+    start_time = time.perf_counter()
+    matrix, expected_rewards = get_linear_system(grid_size, discount)
+    build_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    iterations = 0
+
+    if method == 'direct':
+        state_values = scipy.sparse.linalg.spsolve(matrix.tocsc(), expected_rewards)
+    elif method in ('gmres', 'bicgstab'):
+        # Jacobi preconditioner: the inverse of the diagonal of I − 𝛾𝑃
+        inverse_diagonal = 1.0 / matrix.diagonal()
+        preconditioner = scipy.sparse.linalg.LinearOperator(matrix.shape, matvec=lambda x: inverse_diagonal * x.ravel())
+
+        def count_iteration(_):
+            nonlocal iterations
+            iterations += 1
+
+        if method == 'gmres':
+            state_values, status = scipy.sparse.linalg.gmres(matrix, expected_rewards, rtol=tolerance, maxiter=max_iterations,
+                                                             M=preconditioner, callback=count_iteration, callback_type='pr_norm')
+        else:
+            state_values, status = scipy.sparse.linalg.bicgstab(matrix, expected_rewards, rtol=tolerance, maxiter=max_iterations,
+                                                                M=preconditioner, callback=count_iteration)
+        if status != 0:
+            raise RuntimeError('%s did not converge within %d iterations' % (method, max_iterations))
+    else:
+        raise ValueError('Unknown method: %s' % method)
+
+    solve_time = time.perf_counter() - start_time
+
+    residual = np.abs(expected_rewards - matrix @ state_values).max()
+
+    return state_values.reshape(grid_size, grid_size), dict(method=method, iterations=iterations, residual=residual,
+                                                            build_time=build_time, solve_time=solve_time)
+
+    # endregion Body
+
+# endregion Functions
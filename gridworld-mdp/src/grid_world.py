@@ -67,12 +67,49 @@ def step(state, action):
     return next_state, reward
     # endregion Body
 
-def draw(grid, is_policy: bool = False):
+def get_model(grid_size=grid_size):
+    # region Summary
+    """
+    Tabulate the dynamics of step() for every state and action of a gridworld of any size (at least 5, so that it contains A, A',
+    B and B'), with array operations: step() itself reads the module's grid_size, so it cannot be called for other sizes, and
+    calling it 4 times per state would be too slow for large grids. States are numbered i * grid_size + j.
+    :param grid_size: Size of rectangular (square) gridworld
+    :return: (grid_size², 4) next states (denoted as 𝑠′), (grid_size², 4) rewards (denoted as 𝑟)
+    """
+    # endregion Summary
+
+    # region Body
+
+    i, j = np.divmod(np.arange(grid_size * grid_size), grid_size)
+
+    next_states = np.zeros((grid_size * grid_size, len(actions)), dtype=np.int64)
+    rewards = np.zeros((grid_size * grid_size, len(actions)))
+
+    for a, action in enumerate(actions):
+        next_i, next_j = i + action[0], j + action[1]
+
+        # Actions that would take the agent off the grid leave its location unchanged, but also result in a reward of -1.
+        off_grid = (next_i < 0) | (next_i >= grid_size) | (next_j < 0) | (next_j >= grid_size)
+        next_states[:, a] = np.where(off_grid, i * grid_size + j, next_i * grid_size + next_j)
+        rewards[:, a] = np.where(off_grid, -1.0, 0.0)
+
+    # From state A, all 4 actions yield a reward of +10 and take the agent to A'; from state B, +5 and B'.
+    for coordinates, prime_coordinates, reward in [(A_coordinates, A_prime_coordinates, 10.0), (B_coordinates, B_prime_coordinates, 5.0)]:
+        next_states[coordinates[0] * grid_size + coordinates[1]] = prime_coordinates[0] * grid_size + prime_coordinates[1]
+        rewards[coordinates[0] * grid_size + coordinates[1]] = reward
+
+    return next_states, rewards
+
+    # endregion Body
+
+def draw(grid, is_policy: bool = False, greedy_actions=None):
     # region Summary
     """
     Draw grid of state-value function or grid of policy
     :param grid: State value function or policy grid
     :param is_policy: True, if grid represents policy; otherwise, False
+    :param greedy_actions: Bitmasks of the best actions of every cell (bit a set for action a), e.g. from value_iteration();
+                           if given, the policy is drawn from them instead of stepping from every cell
     """
     # endregion Summary
 
@@ -86,7 +123,11 @@ def draw(grid, is_policy: bool = False):
 
     # Add cells
     for (i, j), cell_value in np.ndenumerate(grid):
-        if is_policy:
+        if is_policy and greedy_actions is not None:
+            # Add the arrows corresponding to the best actions' bits to the cell value
+            cell_value = ''.join(arrow for a, arrow in enumerate(arrows) if greedy_actions[i, j] >> a & 1)
+
+        elif is_policy:
             # Create an empty list of next values
             next_values = []
 
@@ -0,0 +1,93 @@
+import numpy as np
+
+from .grid_world import get_model
+
+# region Fields
+
+# Discount rate (denoted as 0 ≤ 𝛾 ≤ 1)
+discount = 0.9
+
+# endregion Fields
+
+# region Functions
+
+def get_greedy_actions(state_values, next_states, rewards, discount=discount, tolerance=1e-6):
+    # region Summary
+    """
+    Get the greedy actions of every state as a bitmask: bit a is set if action a achieves the maximum in the Bellman optimality
+    equation (arrows for all actions achieving the maximum, as in Figure 3.5).
+    :param state_values: (n_states,) state values
+    :param next_states: (n_states, 4) next states (denoted as 𝑠′), see get_model()
+    :param rewards: (n_states, 4) rewards (denoted as 𝑟), see get_model()
+    :param discount: Discount rate (denoted as 0 ≤ 𝛾 ≤ 1)
+    :param tolerance: actions whose value is within this of the maximum count as ties, so that ties do not depend on rounding
+    :return: (n_states,) uint8 bitmasks
+    """
+    # endregion Summary
+
+    # region Body
+
+    # Action values (denoted as 𝑞(𝑠, 𝑎) = 𝑟 + 𝛾𝑣(𝑠′))
+    action_values = rewards + discount * state_values[next_states]
+    greedy = action_values >= action_values.max(axis=1, keepdims=True) - tolerance
+
+    return (greedy << np.arange(next_states.shape[1], dtype=np.uint8)).sum(axis=1).astype(np.uint8)
+
+    # endregion Body
+
+def value_iteration(grid_size=5, discount=discount, threshold=1e-4, max_iterations=10000, tolerance=1e-6):
+    # region Summary
+    """
+    Compute the optimal state values (Figure 3.5) by value iteration, every sweep being 1 maximum over the actions of all states.
+    Iteration stops when the span seminorm sp(𝑣_𝑘+1 − 𝑣_𝑘) = max(𝑣_𝑘+1 − 𝑣_𝑘) − min(𝑣_𝑘+1 − 𝑣_𝑘) is below 𝜃(1 − 𝛾)/𝛾; then 𝑣_∗ lies
+    between 𝑣_𝑘+1 + 𝛾/(1 − 𝛾) min(𝑣_𝑘+1 − 𝑣_𝑘) and 𝑣_𝑘+1 + 𝛾/(1 − 𝛾) max(𝑣_𝑘+1 − 𝑣_𝑘), and the midpoint of these bounds is returned
+    (within 𝜃/2 of 𝑣_∗, usually in far fewer sweeps than a stop on the largest change).
+    :param grid_size: Size of rectangular (square) gridworld
+    :param discount: Discount rate (denoted as 0 ≤ 𝛾 < 1)
+    :param threshold: Small threshold determining accuracy of estimation (denoted as 𝜃 > 0)
+    :param max_iterations: maximum number of sweeps (RuntimeError if the span is still above 𝜃(1 − 𝛾)/𝛾 after them)
+    :param tolerance: tolerance of the ties between greedy actions (see get_greedy_actions())
+    :return: (grid_size, grid_size) optimal state values, (grid_size, grid_size) uint8 bitmasks of the greedy actions (see draw()),
+             number of sweeps
+    """
+    # endregion Summary
+
+    # region Body
+
+    next_states, rewards = get_model(grid_size)
+
+    # State-value function table, 1 value per state
+    state_values = np.zeros(grid_size * grid_size)
+
+    # 1 row per action, so that the maximum over the actions is an elementwise maximum of contiguous rows
+    action_next_states, action_rewards = next_states.T.copy(), rewards.T.copy()
+
+    # Buffer of the action values (denoted as 𝑞(𝑠, 𝑎)), so that no temporary is allocated by the sweeps
+    action_values = np.zeros(action_next_states.shape)
+
+    for iteration in range(1, max_iterations + 1):
+        # Bellman optimality equation: 𝑣_𝑘+1(𝑠) = max_𝑎 [𝑟 + 𝛾𝑣_𝑘(𝑠′)]
+        np.take(state_values, action_next_states, out=action_values)
+        action_values *= discount
+        action_values += action_rewards
+        new_state_values = action_values.max(axis=0)
+
+        differences = new_state_values - state_values
+        state_values = new_state_values
+
+        # Check value convergence on the span seminorm
+        if differences.max() - differences.min() < threshold * (1 - discount) / discount:
+            break
+    else:
+        raise RuntimeError('Value iteration did not converge within %d sweeps' % max_iterations)
+
+    # Extrapolate to the midpoint of the bounds on 𝑣_∗
+    state_values = state_values + discount / (1 - discount) * (differences.max() + differences.min()) / 2
+
+    greedy_actions = get_greedy_actions(state_values, next_states, rewards, discount, tolerance)
+
+    return state_values.reshape(grid_size, grid_size), greedy_actions.reshape(grid_size, grid_size), iteration
+
+    # endregion Body
+
+# endregion Functions
@@ -0,0 +1,239 @@
+import numpy as np
+import scipy.sparse
+
+# region Fields
+
+# Compiled models, keyed by the step function, the actions, the grid's shape and the hyper-parameters (see get_cache_key())
+cache = dict()
+
+# endregion Fields
+
+class TabularMDP:
+    # region Constructor
+
+    def __init__(self, states, actions, next_states, rewards, terminal, transition_probabilities=None):
+        # region Summary
+        """
+        Tabular Markov Decision Process compiled to arrays: states and actions are numbered in the order they were given.
+        :param states: list of states (e.g. coordinates [i, j])
+        :param actions: list of actions
+        :param next_states: (S, A) int32 index of the next state (denoted as 𝑠′) of every state and action (of the most likely one,
+                            for stochastic models)
+        :param rewards: (S, A) float32 (expected) reward (denoted as 𝑟) of every state and action
+        :param terminal: (S,) bool, True for terminal states
+        :param transition_probabilities: (S * A, S) scipy.sparse.csr_matrix of probabilities 𝑝(𝑠′|𝑠, 𝑎), row s * A + a
+                                         (None for deterministic models: see transition_matrix())
+        """
+        # endregion Summary
+
+        # region Body
+
+        self.states = states
+        self.actions = actions
+        self.next_states = next_states
+        self.rewards = rewards
+        self.terminal = terminal
+        self.transition_probabilities = transition_probabilities
+
+        # Index of every state
+        self.indices = {state_key(state): i for i, state in enumerate(states)}
+
+        # endregion Body
+
+    # endregion Constructor
+
+    # region Functions
+
+    def index(self, state):
+        # region Summary
+        """
+        Get the index of a state.
+        :param state: state
+        :return: index of the state
+        """
+        # endregion Summary
+
+        # region Body
+
+        return self.indices[state_key(state)]
+
+        # endregion Body
+
+    def transition_matrix(self):
+        # region Summary
+        """
+        Get the transition probabilities as a sparse matrix (built from next_states for deterministic models).
+        :return: (S * A, S) scipy.sparse.csr_matrix of probabilities 𝑝(𝑠′|𝑠, 𝑎), row s * A + a
+        """
+        # endregion Summary
+
+        # region Body
+
+        if self.transition_probabilities is not None:
+            return self.transition_probabilities
+
+        n_states, n_actions = self.next_states.shape
+        return scipy.sparse.csr_matrix((np.ones(n_states * n_actions, dtype=np.float32), self.next_states.ravel(),
+                                        np.arange(n_states * n_actions + 1)), shape=(n_states * n_actions, n_states))
+
+        # endregion Body
+
+    # endregion Functions
+
+
+def state_key(state):
+    # region Summary
+    """
+    Get a hashable key of a state (states given as lists or arrays become tuples).
+    :param state: state
+    :return: key
+    """
+    # endregion Summary
+
+    # region Body
+
+    return tuple(np.asarray(state).ravel().tolist()) if isinstance(state, (list, np.ndarray)) else state
+
+    # endregion Body
+
+def grid_states(height, width):
+    # region Summary
+    """
+    Get the states of a grid world in row-major order.
+    :param height: Number of rows
+    :param width: Number of columns
+    :return: list of coordinates [i, j]
+    """
+    # endregion Summary
+
+    # region Body
+
+    return [[i, j] for i in range(height) for j in range(width)]
+
+    # endregion Body
+
+def get_cache_key(function, actions, height, width, hyper_parameters):
+    # region Summary
+    """
+    Get the key of a compiled model in the cache: the identity of the function, the actions, the grid's shape and the
+    hyper-parameters (independent of how the caller built its lists, and cheap to build on every lookup).
+    :param function: step (or transitions) function
+    :param actions: list of actions
+    :param height: Number of rows
+    :param width: Number of columns
+    :param hyper_parameters: dictionary of everything the function reads besides its arguments (e.g. world, wind, start, goal)
+    :return: key
+    """
+    # endregion Summary
+
+    # region Body
+
+    return (function.__module__, function.__qualname__, repr([state_key(action) for action in actions]), height, width,
+            repr(sorted((name, repr(value)) for name, value in hyper_parameters.items())))
+
+    # endregion Body
+
+def compile_mdp(step, actions, height, width, is_terminal=None, reward=-1.0, hyper_parameters=None):
+    # region Summary
+    """
+    Compile a deterministic grid model by calling its step() once for every state (grid_states(height, width)) and action.
+    :param step: step(state, action) returning the next state and the reward, or only the next state (the reward then is `reward`)
+    :param actions: list of actions, as passed to step()
+    :param height: Number of rows
+    :param width: Number of columns
+    :param is_terminal: is_terminal(state) returning True for terminal states (no state is terminal, if None)
+    :param reward: reward of the step functions that return only the next state
+    :param hyper_parameters: dictionary of everything step() reads besides its arguments (e.g. dict(world=world, wind=wind,
+                             start=start, goal=goal)); the compiled model is cached by them, and recompiled when they change
+    :return: TabularMDP
+    """
+    # endregion Summary
+
+    # region Body
+
+    key = get_cache_key(step, actions, height, width, {} if hyper_parameters is None else hyper_parameters)
+    if key in cache:
+        return cache[key]
+
+    states = grid_states(height, width)
+    indices = {state_key(state): i for i, state in enumerate(states)}
+
+    next_states = np.zeros((len(states), len(actions)), dtype=np.int32)
+    rewards = np.zeros((len(states), len(actions)), dtype=np.float32)
+    terminal = np.zeros(len(states), dtype=bool)
+
+    for s, state in enumerate(states):
+        terminal[s] = is_terminal is not None and bool(is_terminal(state))
+
+        for a, action in enumerate(actions):
+            result = step(state, action)
+
+            # step() returns (next state, reward) or only the next state
+            if isinstance(result, tuple):
+                next_state, rewards[s, a] = result
+            else:
+                next_state, rewards[s, a] = result, reward
+
+            next_states[s, a] = indices[state_key(next_state)]
+
+    cache[key] = TabularMDP(states, actions, next_states, rewards, terminal)
+    return cache[key]
+
+    # endregion Body
+
+def compile_stochastic_mdp(transitions, actions, height, width, is_terminal=None, hyper_parameters=None):
+    # region Summary
+    """
+    Compile a stochastic grid model by calling its transitions() once for every state (grid_states(height, width)) and action.
+    :param transitions: transitions(state, action) returning a list of (probability, next state, reward)
+    :param actions: list of actions, as passed to transitions()
+    :param height: Number of rows
+    :param width: Number of columns
+    :param is_terminal: is_terminal(state) returning True for terminal states (no state is terminal, if None)
+    :param hyper_parameters: dictionary of everything transitions() reads besides its arguments (the cache key, see compile_mdp())
+    :return: TabularMDP with a sparse (S * A, S) transition probability matrix, expected rewards and the most likely next states
+    """
+    # endregion Summary
+
+    # region Body
+
+    key = get_cache_key(transitions, actions, height, width, {} if hyper_parameters is None else hyper_parameters)
+    if key in cache:
+        return cache[key]
+
+    states = grid_states(height, width)
+    indices = {state_key(state): i for i, state in enumerate(states)}
+
+    next_states = np.zeros((len(states), len(actions)), dtype=np.int32)
+    rewards = np.zeros((len(states), len(actions)), dtype=np.float32)
+    terminal = np.zeros(len(states), dtype=bool)
+
+    # Entries of the sparse matrix: row s * A + a, column 𝑠′, probability 𝑝(𝑠′|𝑠, 𝑎)
+    rows, columns, probabilities = [], [], []
+
+    for s, state in enumerate(states):
+        terminal[s] = is_terminal is not None and bool(is_terminal(state))
+
+        for a, action in enumerate(actions):
+            outcomes = transitions(state, action)
+
+            for probability, next_state, outcome_reward in outcomes:
+                rows.append(s * len(actions) + a)
+                columns.append(indices[state_key(next_state)])
+                probabilities.append(probability)
+
+                # expected reward: 𝑟(𝑠, 𝑎) = ∑ 𝑝(𝑠′, 𝑟|𝑠, 𝑎) 𝑟
+                rewards[s, a] += probability * outcome_reward
+
+            next_states[s, a] = indices[state_key(max(outcomes, key=lambda outcome: outcome[0])[1])]
+
+    # Duplicate entries (several outcomes leading to the same next state) are summed
+    transition_probabilities = scipy.sparse.csr_matrix((np.array(probabilities, dtype=np.float32), (rows, columns)),
+                                                       shape=(len(states) * len(actions), len(states)))
+
+    cache[key] = TabularMDP(states, actions, next_states, rewards, terminal, transition_probabilities)
+    return cache[key]
+
+    # endregion Body
+
+# endregion Functions
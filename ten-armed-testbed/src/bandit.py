@@ -1,10 +1,13 @@
 import numpy as np
 
+from .reward_source import StationaryGaussianRewardSource
+
 class Bandit:
     # region Constructor
 
     def __init__(self, arms_number: int = 10, use_sample_averages: bool = False, epsilon=0., initial_action_value_estimates=0., confidence_level=None,
-                 use_gradient: bool = False, step_size=0.1, use_gradient_baseline: bool = False, true_expected_reward=0.):
+                 use_gradient: bool = False, step_size=0.1, use_gradient_baseline: bool = False, true_expected_reward=0.,
+                 reward_source=None):
         # region Summary
         """
         k-armed Bandit.
@@ -17,6 +20,7 @@ class Bandit:
         :param step_size: (denoted as 𝛼) constant step size for updating estimates
         :param use_gradient_baseline: if True, use average reward as baseline for GBA
         :param true_expected_reward: true expected rewards selected from normal (Gaussian) distribution with μ=4 mean and σ=1 variance
+        :param reward_source: environment of the bandit problem (RewardSource); stationary Gaussian with μ=true_expected_reward mean, if None
         """
         # endregion Summary
 
@@ -87,6 +91,9 @@ class Bandit:
 
         # endregion Action-Value Methods
 
+        # Environment that holds the action values and samples the rewards
+        self.reward_source = StationaryGaussianRewardSource(self.true_expected_reward) if reward_source is None else reward_source
+
         # Optimal action
         self.optimal_action = None
 
@@ -105,9 +112,10 @@ class Bandit:
 
         # region Body
 
-        # Initialize action values according to a normal (Gaussian) distribution with μ=0 mean and σ=1 variance.
-        # In case of GBA, add true_expected_reward != 0.
-        self.action_values = np.random.randn(self.k) + self.true_expected_reward
+        # Initialize action values by the reward source (a single problem drawn with the global np.random state), e.g. according to
+        # a normal (Gaussian) distribution with μ=0 mean and σ=1 variance. In case of GBA, add true_expected_reward != 0.
+        self.reward_source.initialize(1, self.k, np.random)
+        self.action_values = self.reward_source.action_values[0]
 
         # In case of realistic initial values, initialize estimated action values with 0s.
         # In case of optimistic initial values, add initial_action_value_estimates != 0
@@ -119,8 +127,16 @@ class Bandit:
         # Initialize number of times each action has been selected to 0 (none of actions has been selected yet)
         self.action_selection_count = np.zeros(self.k)
 
+        # Preallocate GBA buffers, so that act() and step() update them in place instead of allocating new arrays on every step:
+        # 1. action probabilities start as a uniform distribution,
+        # 2. cumulative action probabilities are used to sample an action,
+        # 3. update of action preferences by Equation 2.12
+        self.action_probability = np.full(self.k, 1.0 / self.k)
+        self.cumulative_action_probability = np.empty(self.k)
+        self.preference_update = np.empty(self.k)
+
         # Optimal action is the action with the highest value
-        self.optimal_action = np.argmax(self.action_values)
+        self.optimal_action = self.reward_source.optimal_action[0]
 
         # endregion Body
 
@@ -151,11 +167,17 @@ class Bandit:
 
         # region GBA
         if self.use_gradient:
-            exponential_estimations=np.exp(self.estimated_action_values)
+            # Soft-max distribution computed in place. Preferences are shifted by their maximum first (which does not change the distribution),
+            # so that np.exp never overflows, however large the preferences grow.
+            np.subtract(self.estimated_action_values, np.max(self.estimated_action_values), out=self.action_probability)
+            np.exp(self.action_probability, out=self.action_probability)
+            self.action_probability /= np.sum(self.action_probability)
 
-            self.action_probability = exponential_estimations/np.sum(exponential_estimations)
+            # Sample an action by looking up a uniform number in the cumulative distribution
+            np.cumsum(self.action_probability, out=self.cumulative_action_probability)
+            action = np.searchsorted(self.cumulative_action_probability, np.random.rand() * self.cumulative_action_probability[-1], side='right')
 
-            return np.random.choice(self.actions, p=self.action_probability)
+            return min(action, self.k - 1)
 
         # endregion GBA
 
@@ -180,9 +202,13 @@ class Bandit:
 
         # region Body
 
-        # When a learning method applied to that bandit problem selected action 𝐴_𝑡 at time step 𝑡, the actual reward, 𝑅_𝑡, was selected from
-        # a normal (Gaussian) distribution with μ = 𝑞_∗(𝑎) mean and σ = 1 variance
-        actual_reward = np.random.randn() + self.action_values[action]
+        # Action values faced by this action (they change over time in a non-stationary problem)
+        self.action_values = self.reward_source.action_values[0]
+        self.optimal_action = self.reward_source.optimal_action[0]
+
+        # When a learning method applied to that bandit problem selected action 𝐴_𝑡 at time step 𝑡, the actual reward, 𝑅_𝑡, was sampled by
+        # the reward source, e.g. from a normal (Gaussian) distribution with μ = 𝑞_∗(𝑎) mean and σ = 1 variance
+        actual_reward = self.reward_source.sample_scalar(action)
 
         # Add 1 to time step
         self.time += 1
@@ -199,15 +225,16 @@ class Bandit:
             self.estimated_action_values[action] += (actual_reward - self.estimated_action_values[action]) / self.action_selection_count[action]
 
         elif self.use_gradient: # Update estimated action values using GBA
-            one_hot_encoding = np.zeros(self.k)
-            one_hot_encoding[action] = 1
-
             # The average of the rewards can serve as a baseline with which the reward is compared.
             baseline = self.average_reward if self.use_gradient_baseline else 0
 
             # A natural learning algorithm for soft-max action preferences based on the idea of stochastic gradient ascent:
             # on each step, after selecting action 𝐴_𝑡 and receiving the reward 𝑅_𝑡, the action preferences are updated by Equation 2.12:
-            self.estimated_action_values += self.step_size * (actual_reward - baseline) * (one_hot_encoding - self.action_probability)
+            # 𝐻(𝑎) += 𝛼(𝑅_𝑡 − 𝑅̅_𝑡)(𝟙{𝑎 = 𝐴_𝑡} − 𝜋_𝑡(𝑎)), i.e. −𝛼(𝑅_𝑡 − 𝑅̅_𝑡)𝜋_𝑡(𝑎) for every action and +𝛼(𝑅_𝑡 − 𝑅̅_𝑡) for the selected one
+            gradient_step = self.step_size * (actual_reward - baseline)
+            np.multiply(self.action_probability, -gradient_step, out=self.preference_update)
+            self.preference_update[action] += gradient_step
+            self.estimated_action_values += self.preference_update
 
         else: # Update estimated action values with constant step size
             # Incremental Implementation (Equation 2.3) with constant step size parameter
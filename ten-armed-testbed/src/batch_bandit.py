@@ -0,0 +1,322 @@
+import copy
+
+import numpy as np
+
+from .bandit import Bandit
+from .reward_source import StationaryGaussianRewardSource
+
+class BatchBandit:
+    # region Constructor
+
+    def __init__(self, runs: int = 2000, arms_number: int = 10, use_sample_averages: bool = False, epsilon=0., initial_action_value_estimates=0.,
+                 confidence_level=None, use_gradient: bool = False, step_size=0.1, use_gradient_baseline: bool = False, true_expected_reward=0.,
+                 random_generator=None, reward_source=None):
+        # region Summary
+        """
+        Batch of k-armed Bandits: every run is an independent bandit problem and all of them are stepped together.
+        :param runs: number of independent bandit problems (runs) kept in the batch
+        :param arms_number: (denoted as k) number of bandit's arms
+        :param use_sample_averages: if True, use sample-average method for estimating action values
+        :param epsilon: (denoted as ε) probability for exploration in ε-greedy algorithm
+        :param initial_action_value_estimates: (denoted as 𝑄_1(𝑎)) initial estimation for each action value
+        :param confidence_level: (denoted as 𝑐) if not None, use Upper-Confidence-Bound (UCB) action selection
+        :param use_gradient: if True, use Gradient Bandit Algorithm (GBA)
+        :param step_size: (denoted as 𝛼) constant step size for updating estimates
+        :param use_gradient_baseline: if True, use average reward as baseline for GBA
+        :param true_expected_reward: true expected rewards selected from normal (Gaussian) distribution with μ=4 mean and σ=1 variance
+        :param random_generator: np.random.Generator used for every random draw of the batch (a fresh one, if None)
+        :param reward_source: environment of the bandit problems (RewardSource); stationary Gaussian with μ=true_expected_reward mean, if None
+
+        epsilon, initial_action_value_estimates, confidence_level and step_size can also be given as arrays with 1 value per run.
+        """
+        # endregion Summary
+
+        # region Body
+
+        self.runs = runs
+        self.k = arms_number
+        self.actions = np.arange(self.k)
+
+        # Index of every run, used to pick 1 action per run out of (runs, k) arrays
+        self.run_indices = np.arange(self.runs)
+
+        self.random_generator = np.random.default_rng() if random_generator is None else random_generator
+
+        # Value of each action in each run (denoted as 𝑞_∗(𝑎)), shape (runs, k)
+        self.action_values = None
+
+        # Estimated value of each action in each run (denoted as 𝑄_𝑡(𝑎)), shape (runs, k)
+        self.estimated_action_values = None
+
+        # region Action-Value Methods
+
+        self.use_sample_averages = use_sample_averages
+
+        # region Action Selection Methods
+
+        # Per-run parameters are kept as arrays of shape (runs,), so that 1 batch can hold different configurations
+        self.epsilon = np.broadcast_to(np.asarray(epsilon, dtype=float), (self.runs,))
+
+        self.initial_action_value_estimates = np.broadcast_to(np.asarray(initial_action_value_estimates, dtype=float), (self.runs,))
+
+        self.confidence_level = None if confidence_level is None else np.broadcast_to(np.asarray(confidence_level, dtype=float), (self.runs,))
+
+        # Time steps (shared by all runs, because all of them are stepped together)
+        self.time = 0
+
+        # Number of times each action has been selected in each run (denoted as 𝑁_𝑡(𝑎)), shape (runs, k)
+        self.action_selection_count = None
+
+        self.use_gradient = use_gradient
+
+        # Probability of taking action 𝑎 at time 𝑡 in each run (denoted as 𝜋_𝑡(𝑎)), shape (runs, k)
+        self.action_probability = None
+
+        self.step_size = np.broadcast_to(np.asarray(step_size, dtype=float), (self.runs,))
+
+        # Average of the rewards up to (but not including) time 𝑡 in each run (denoted as 𝑅̅_𝑡), shape (runs,)
+        self.average_reward = None
+
+        self.use_gradient_baseline = use_gradient_baseline
+
+        self.true_expected_reward = true_expected_reward
+
+        # endregion Action Selection Methods
+
+        # endregion Action-Value Methods
+
+        # Environment that holds the action values of every run and samples the rewards
+        self.reward_source = StationaryGaussianRewardSource(self.true_expected_reward) if reward_source is None else reward_source
+
+        # Optimal action of each run, shape (runs,)
+        self.optimal_action = None
+
+        # endregion Body
+
+    # endregion Constructor
+
+    # region Functions
+
+    @classmethod
+    def from_bandit(cls, bandit: Bandit, runs: int, random_generator=None):
+        # region Summary
+        """
+        Create a batch that runs the configuration of a single Bandit for many runs.
+        :param bandit: Bandit whose configuration is copied
+        :param runs: number of independent bandit problems (runs)
+        :param random_generator: np.random.Generator used for every random draw of the batch
+        :return: BatchBandit
+        """
+        # endregion Summary
+
+        # region Body
+
+        return cls(runs=runs, arms_number=bandit.k, use_sample_averages=bandit.use_sample_averages, epsilon=bandit.epsilon,
+                   initial_action_value_estimates=bandit.initial_action_value_estimates, confidence_level=bandit.confidence_level,
+                   use_gradient=bandit.use_gradient, step_size=bandit.step_size, use_gradient_baseline=bandit.use_gradient_baseline,
+                   true_expected_reward=bandit.true_expected_reward, random_generator=random_generator,
+                   reward_source=copy.deepcopy(bandit.reward_source))
+
+        # endregion Body
+
+    def initialize(self, action_values=None):
+        # region Summary
+        """
+        Initialize action parameters of every run
+        :param action_values: (runs, k) action values to use instead of drawing new ones (e.g. to share problems between batches)
+        """
+        # endregion Summary
+
+        # region Body
+
+        # Initialize action values by the reward source, e.g. according to a normal (Gaussian) distribution with μ=0 mean and σ=1 variance.
+        # In case of GBA, add true_expected_reward != 0.
+        self.reward_source.initialize(self.runs, self.k, self.random_generator, action_values)
+        self.action_values = self.reward_source.action_values
+
+        # In case of realistic initial values, initialize estimated action values with 0s.
+        # In case of optimistic initial values, add initial_action_value_estimates != 0
+        self.estimated_action_values = np.zeros((self.runs, self.k)) + self.initial_action_value_estimates[:, None]
+
+        # Set time steps to 0
+        self.time = 0
+
+        # Initialize number of times each action has been selected to 0 (none of actions has been selected yet)
+        self.action_selection_count = np.zeros((self.runs, self.k))
+
+        # Initialize average reward of every run to 0
+        self.average_reward = np.zeros(self.runs)
+
+        # Initialize action probabilities (used by GBA) with a uniform distribution
+        self.action_probability = np.full((self.runs, self.k), 1.0 / self.k)
+
+        # Optimal action is the action with the highest value
+        self.optimal_action = self.reward_source.optimal_action
+
+        # endregion Body
+
+    def argmax_random_tie(self, values):
+        # region Summary
+        """
+        Select, for every run, one of the actions with the highest value, breaking ties randomly.
+        :param values: (runs, k) values
+        :return: (runs,) actions
+        """
+        # endregion Summary
+
+        # region Body
+
+        # Mark the greedy actions of every run
+        is_greedy = values == np.max(values, axis=1, keepdims=True)
+
+        # The first greedy action is the answer, unless a run has more than 1 greedy action
+        actions = np.argmax(is_greedy, axis=1)
+        tied_runs = np.flatnonzero(np.count_nonzero(is_greedy, axis=1) > 1)
+
+        # Give every greedy action of a tied run a random key in [1, 2) and every other action 0, so that the argmax is uniform among greedy actions
+        if tied_runs.size:
+            keys = np.where(is_greedy[tied_runs], 1.0 + self.random_generator.random((tied_runs.size, self.k)), 0.0)
+            actions[tied_runs] = np.argmax(keys, axis=1)
+
+        return actions
+
+        # endregion Body
+
+    def act(self):
+        # region Summary
+        """
+        Get an action for every bandit of the batch.
+        :return: (runs,) actions
+        """
+        # endregion Summary
+
+        # region Body
+
+        # region UCB / GBA / Greedy
+
+        if self.confidence_level is not None:
+            UCB_estimation = self.estimated_action_values + self.confidence_level[:, None] * np.sqrt(np.log(self.time + 1) / (self.action_selection_count + 1e-5))
+            actions = self.argmax_random_tie(UCB_estimation)
+
+        elif self.use_gradient:
+            # Soft-max distribution shifted by the highest preference of each run, so that np.exp never overflows
+            exponential_estimations = np.exp(self.estimated_action_values - np.max(self.estimated_action_values, axis=1, keepdims=True))
+
+            self.action_probability = exponential_estimations / np.sum(exponential_estimations, axis=1, keepdims=True)
+
+            # Sample 1 action per run by looking up a uniform number in the cumulative distribution
+            cumulative_probability = np.cumsum(self.action_probability, axis=1)
+            uniform = self.random_generator.random(self.runs) * cumulative_probability[:, -1]
+            actions = np.minimum(np.sum(cumulative_probability <= uniform[:, None], axis=1), self.k - 1)
+
+        else:
+            actions = self.argmax_random_tie(self.estimated_action_values)
+
+        # endregion UCB / GBA / Greedy
+
+        # region ε-greedy
+
+        # ε-greedy action selection: in every run, with small probability ε, select randomly from among all the actions with equal probability
+        explore = self.random_generator.random(self.runs) < self.epsilon
+        actions[explore] = self.random_generator.integers(self.k, size=np.count_nonzero(explore))
+
+        # endregion ε-greedy
+
+        return actions
+
+        # endregion Body
+
+    def step(self, actions):
+        # region Summary
+        """
+        Update estimated action values and return rewards for the actions of every run.
+        :param actions: (runs,) actions
+        :return: (runs,) rewards
+        """
+        # endregion Summary
+
+        # region Body
+
+        # Action values faced by these actions (they change over time in non-stationary problems)
+        self.action_values = self.reward_source.action_values
+        self.optimal_action = self.reward_source.optimal_action
+
+        # The actual reward of each run, 𝑅_𝑡, is sampled by the reward source, e.g. from a normal (Gaussian) distribution with μ = 𝑞_∗(𝑎) mean and σ = 1 variance
+        actual_rewards = self.reward_source.sample(actions)
+
+        # Add 1 to time step
+        self.time += 1
+
+        # Add 1 to number of times the selected actions have been selected
+        self.action_selection_count[self.run_indices, actions] += 1
+
+        # The average of the rewards can be computed incrementally
+        self.average_reward += (actual_rewards - self.average_reward) / self.time
+
+        # Estimated values of the selected actions
+        selected_estimates = self.estimated_action_values[self.run_indices, actions]
+
+        if self.use_sample_averages: # Update estimated action values using sample-average method
+            # Incremental Implementation (Equation 2.3)
+            self.estimated_action_values[self.run_indices, actions] += (actual_rewards - selected_estimates) / self.action_selection_count[self.run_indices, actions]
+
+        elif self.use_gradient: # Update estimated action values using GBA
+            # The average of the rewards can serve as a baseline with which the reward is compared.
+            baseline = self.average_reward if self.use_gradient_baseline else 0
+
+            # Equation 2.12 for every run: 𝐻(𝑎) += 𝛼(𝑅_𝑡 − 𝑅̅_𝑡)(𝟙{𝑎 = 𝐴_𝑡} − 𝜋_𝑡(𝑎))
+            gradient_step = self.step_size * (actual_rewards - baseline)
+            self.estimated_action_values -= gradient_step[:, None] * self.action_probability
+            self.estimated_action_values[self.run_indices, actions] += gradient_step
+
+        else: # Update estimated action values with constant step size
+            # Incremental Implementation (Equation 2.3) with constant step size parameter
+            self.estimated_action_values[self.run_indices, actions] += self.step_size * (actual_rewards - selected_estimates)
+
+        return actual_rewards
+
+        # endregion Body
+
+    # endregion Functions
+
+
+def simulate(runs, times, bandits, random_generator=None):
+    # region Summary
+    """
+    Vectorized counterpart of the notebook's simulate(): every Bandit configuration is run for all runs at once.
+    :param runs: Number of runs
+    :param times: Number of times
+    :param bandits: Bandit problems (Bandit objects, whose configurations are used)
+    :param random_generator: np.random.Generator shared by all configurations (a fresh one, if None)
+    :return: Optimal action count mean and reward mean, both of shape (len(bandits), times)
+    """
+    # endregion Summary
+
+    # region Body
+
+    random_generator = np.random.default_rng() if random_generator is None else random_generator
+
+    # Prepare matrices filled with 0s for mean rewards and mean optimal action counts
+    rewards = np.zeros((len(bandits), times))
+    optimal_action_counts = np.zeros(rewards.shape)
+
+    # For every bandit
+    for i, bandit in enumerate(bandits):
+        # create and initialize a batch of all runs
+        batch = BatchBandit.from_bandit(bandit, runs, random_generator)
+        batch.initialize()
+
+        # for every time step
+        for time in range(times):
+            # select an action in every run
+            actions = batch.act()
+
+            # get the mean reward over runs
+            rewards[i, time] = batch.step(actions).mean()
+
+            # get the fraction of runs in which the selected action is optimal
+            optimal_action_counts[i, time] = np.mean(actions == batch.optimal_action)
+
+    return optimal_action_counts, rewards
+
+    # endregion Body
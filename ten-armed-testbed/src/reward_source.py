@@ -0,0 +1,428 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+class RewardSource(ABC):
+    # region Constructor
+
+    def __init__(self, block_size: int = 100):
+        # region Summary
+        """
+        Environment of a batch of k-armed bandit problems: holds the action values of every run and samples the rewards of selected actions.
+        Random numbers are generated in blocks of block_size time steps rather than once per step.
+        :param block_size: number of time steps generated at once
+        """
+        # endregion Summary
+
+        # region Body
+
+        self.block_size = block_size
+
+        # Number of runs (independent bandit problems) and number of arms
+        self.runs = None
+        self.k = None
+
+        # Index of every run, used to pick 1 action per run out of (runs, k) arrays
+        self.run_indices = None
+
+        # Random generator (np.random.Generator or the np.random module) used for all random draws
+        self.random_generator = None
+
+        # Value of each action in each run at the current time step (denoted as 𝑞_∗(𝑎)), shape (runs, k)
+        self.action_values = None
+
+        # Optimal action of every run at the current time step, shape (runs,): recomputed only when the action values change
+        self.optimal_action = None
+
+        # Position of the current time step within the current block
+        self.block_time = 0
+
+        # endregion Body
+
+    # endregion Constructor
+
+    # region Functions
+
+    def update_optimal_action(self):
+        # region Summary
+        """
+        Recompute the optimal action of every run, after the action values changed.
+        """
+        # endregion Summary
+
+        # region Body
+
+        self.optimal_action = np.argmax(self.action_values, axis=1)
+
+        # endregion Body
+
+    def initialize(self, runs, arms_number, random_generator, action_values=None):
+        # region Summary
+        """
+        Initialize the bandit problems.
+        :param runs: number of independent bandit problems
+        :param arms_number: (denoted as k) number of bandit's arms
+        :param random_generator: np.random.Generator or the np.random module
+        :param action_values: (runs, k) initial action values to use instead of drawing them
+        """
+        # endregion Summary
+
+        # region Body
+
+        self.runs = runs
+        self.k = arms_number
+        self.run_indices = np.arange(self.runs)
+        self.random_generator = random_generator
+
+        self.action_values = self.initial_action_values() if action_values is None else np.array(action_values, dtype=float).reshape(self.runs, self.k)
+        self.update_optimal_action()
+
+        # Generate the 1st block
+        self.generate_block()
+        self.block_time = 0
+
+        # endregion Body
+
+    def next_block(self):
+        # region Summary
+        """
+        Move to the next block, once the current one is used up (shared by sample() and sample_scalar()).
+        """
+        # endregion Summary
+
+        # region Body
+
+        self.generate_block()
+        self.block_time = 0
+
+        # endregion Body
+
+    def sample(self, actions):
+        # region Summary
+        """
+        Sample the rewards of the selected actions and move to the next time step.
+        :param actions: (runs,) actions
+        :return: (runs,) rewards
+        """
+        # endregion Summary
+
+        # region Body
+
+        # Generate the next block, when the current one is used up
+        if self.block_time == self.block_size:
+            self.next_block()
+
+        rewards = self.block_rewards(actions)
+
+        self.block_time += 1
+
+        return rewards
+
+        # endregion Body
+
+    def sample_scalar(self, action):
+        # region Summary
+        """
+        Sample the reward of the action selected in a single bandit problem (runs = 1) and move to the next time step,
+        without the (runs,) arrays of sample().
+        :param action: action
+        :return: reward
+        """
+        # endregion Summary
+
+        # region Body
+
+        # Generate the next block, when the current one is used up
+        if self.block_time == self.block_size:
+            self.next_block()
+
+        reward = self.block_reward(action)
+
+        self.block_time += 1
+
+        return reward
+
+        # endregion Body
+
+    @abstractmethod
+    def initial_action_values(self):
+        # region Summary
+        """
+        Draw the initial action values.
+        :return: (runs, k) action values
+        """
+        # endregion Summary
+
+        # region Body
+
+        pass
+
+        # endregion Body
+
+    @abstractmethod
+    def generate_block(self):
+        # region Summary
+        """
+        Generate the random numbers of the next block_size time steps.
+        """
+        # endregion Summary
+
+        # region Body
+
+        pass
+
+        # endregion Body
+
+    @abstractmethod
+    def block_rewards(self, actions):
+        # region Summary
+        """
+        Get the rewards of the selected actions at the current time step of the block.
+        :param actions: (runs,) actions
+        :return: (runs,) rewards
+        """
+        # endregion Summary
+
+        # region Body
+
+        pass
+
+        # endregion Body
+
+    def block_reward(self, action):
+        # region Summary
+        """
+        Get the reward of the action selected in the 1st run at the current time step of the block (used by sample_scalar();
+        sources override it with a scalar lookup).
+        :param action: action
+        :return: reward
+        """
+        # endregion Summary
+
+        # region Body
+
+        return float(self.block_rewards(np.full(self.runs, action))[0])
+
+        # endregion Body
+
+    # endregion Functions
+
+
+class StationaryGaussianRewardSource(RewardSource):
+    # region Constructor
+
+    def __init__(self, mean=0., block_size: int = 100):
+        # region Summary
+        """
+        Stationary bandit problems of the 10-armed testbed: action values are selected from a normal (Gaussian) distribution
+        with μ=mean and σ=1, and rewards from a normal (Gaussian) distribution with μ=𝑞_∗(𝑎) and σ=1.
+        :param mean: mean of the action values (true_expected_reward of the Bandit)
+        :param block_size: number of time steps generated at once
+        """
+        # endregion Summary
+
+        # region Body
+
+        super().__init__(block_size)
+
+        self.mean = mean
+
+        # Reward noise of every time step of the block in every run, shape (block_size, runs)
+        self.noise = None
+
+        # endregion Body
+
+    # endregion Constructor
+
+    # region Functions
+
+    def initial_action_values(self):
+        return self.random_generator.standard_normal((self.runs, self.k)) + self.mean
+
+    def generate_block(self):
+        self.noise = self.random_generator.standard_normal((self.block_size, self.runs))
+
+    def block_rewards(self, actions):
+        return self.noise[self.block_time] + self.action_values[self.run_indices, actions]
+
+    def block_reward(self, action):
+        return float(self.noise[self.block_time, 0] + self.action_values[0, action])
+
+    # endregion Functions
+
+
+class RandomWalkRewardSource(RewardSource):
+    # region Constructor
+
+    def __init__(self, initial_value=0., walk_scale=0.01, block_size: int = 100):
+        # region Summary
+        """
+        Non-stationary bandit problems of Exercise 2.5: all action values start out equal and then take independent random walks
+        (a normally distributed increment with μ=0 and σ=walk_scale is added to every action value on each step).
+        Rewards are selected from a normal (Gaussian) distribution with μ=𝑞_∗(𝑎) and σ=1.
+        :param initial_value: initial value of every action
+        :param walk_scale: standard deviation of the random walk's increments
+        :param block_size: number of time steps generated at once
+        """
+        # endregion Summary
+
+        # region Body
+
+        super().__init__(block_size)
+
+        self.initial_value = initial_value
+        self.walk_scale = walk_scale
+
+        # Action values of every time step of the block in every run, shape (block_size, runs, k)
+        self.block_action_values = None
+
+        # Action values right after the block, i.e. at the 1st time step of the next block, shape (runs, k)
+        self.next_action_values = None
+
+        # Reward noise of every time step of the block in every run, shape (block_size, runs)
+        self.noise = None
+
+        # endregion Body
+
+    # endregion Constructor
+
+    # region Functions
+
+    def initial_action_values(self):
+        return np.full((self.runs, self.k), float(self.initial_value))
+
+    def generate_block(self):
+        # Start the block from the action values reached by the previous block (or from the initial ones)
+        start_action_values = self.action_values
+
+        # Random walk of the whole block: cumulative sum of the increments
+        increments = self.random_generator.normal(0, self.walk_scale, (self.block_size, self.runs, self.k))
+        walk = np.cumsum(increments, axis=0)
+
+        # Action values before each step of the block (exclusive cumulative sum) and after the last one
+        self.block_action_values = start_action_values + walk - increments
+        self.next_action_values = start_action_values + walk[-1]
+
+        self.action_values = self.block_action_values[0]
+        self.update_optimal_action()
+
+        self.noise = self.random_generator.standard_normal((self.block_size, self.runs))
+
+    def block_rewards(self, actions):
+        rewards = self.noise[self.block_time] + self.block_action_values[self.block_time, self.run_indices, actions]
+
+        self.walk()
+
+        return rewards
+
+    def block_reward(self, action):
+        reward = float(self.noise[self.block_time, 0] + self.block_action_values[self.block_time, 0, action])
+
+        self.walk()
+
+        return reward
+
+    def walk(self):
+        # region Summary
+        """
+        Action values take a step of the random walk (so the optimal actions are recomputed).
+        """
+        # endregion Summary
+
+        # region Body
+
+        self.action_values = self.block_action_values[self.block_time + 1] if self.block_time + 1 < self.block_size else self.next_action_values
+        self.update_optimal_action()
+
+        # endregion Body
+
+    # endregion Functions
+
+
+class BernoulliRewardSource(RewardSource):
+    # region Constructor
+
+    def __init__(self, block_size: int = 100):
+        # region Summary
+        """
+        Bernoulli bandit problems: every action pays a reward of 1 with probability 𝑞_∗(𝑎) (selected uniformly from [0, 1)), and 0 otherwise.
+        :param block_size: number of time steps generated at once
+        """
+        # endregion Summary
+
+        # region Body
+
+        super().__init__(block_size)
+
+        # Uniform numbers of every time step of the block in every run, shape (block_size, runs)
+        self.uniform = None
+
+        # endregion Body
+
+    # endregion Constructor
+
+    # region Functions
+
+    def initial_action_values(self):
+        return self.random_generator.random((self.runs, self.k))
+
+    def generate_block(self):
+        self.uniform = self.random_generator.random((self.block_size, self.runs))
+
+    def block_rewards(self, actions):
+        return (self.uniform[self.block_time] < self.action_values[self.run_indices, actions]).astype(float)
+
+    def block_reward(self, action):
+        return 1.0 if self.uniform[self.block_time, 0] < self.action_values[0, action] else 0.0
+
+    # endregion Functions
+
+
+class ReplayRewardSource(RewardSource):
+    # region Constructor
+
+    def __init__(self, rewards):
+        # region Summary
+        """
+        Replay recorded rewards: the reward of action 𝑎 at time step 𝑡 is rewards[𝑡, 𝑎] (the same for every run),
+        or rewards[run, 𝑡, 𝑎] (1 recording per run). Action values are the mean recorded rewards of every action.
+        :param rewards: (times, k) or (runs, times, k) recorded rewards
+        """
+        # endregion Summary
+
+        # region Body
+
+        self.rewards = np.asarray(rewards, dtype=float)
+
+        # The whole recording is a single block
+        super().__init__(self.rewards.shape[-2])
+
+        # endregion Body
+
+    # endregion Constructor
+
+    # region Functions
+
+    def initialize(self, runs, arms_number, random_generator, action_values=None):
+        if action_values is not None:
+            raise ValueError('Action values of a replayed recording are given by the recording')
+        if self.rewards.shape[-1] != arms_number or (self.rewards.ndim == 3 and self.rewards.shape[0] != runs):
+            raise ValueError(f'Recording of shape {self.rewards.shape} does not fit {runs} runs of {arms_number} arms')
+        super().initialize(runs, arms_number, random_generator)
+
+    def next_block(self):
+        # The recording is a single block: sample() and sample_scalar() cannot go past its end
+        raise IndexError(f'Recording of {self.block_size} time steps is used up')
+
+    def initial_action_values(self):
+        return np.broadcast_to(self.rewards.mean(axis=-2), (self.runs, self.k)).copy()
+
+    def generate_block(self):
+        pass
+
+    def block_rewards(self, actions):
+        if self.rewards.ndim == 2:
+            return self.rewards[self.block_time, actions]
+        return self.rewards[self.run_indices, self.block_time, actions]
+
+    # endregion Functions
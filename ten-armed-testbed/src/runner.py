@@ -0,0 +1,98 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .batch_bandit import BatchBandit
+
+# region Functions
+
+def simulate_shard(shard_runs, times, bandits, seed_sequence):
+    # region Summary
+    """
+    Simulate every Bandit configuration on 1 shard of runs with the shard's own random generator.
+    :param shard_runs: Number of runs in the shard
+    :param times: Number of times
+    :param bandits: Bandit problems (Bandit objects, whose configurations are used)
+    :param seed_sequence: np.random.SeedSequence of the shard
+    :return: Optimal action count sum and reward sum over the shard's runs, both of shape (len(bandits), times)
+    """
+    # endregion Summary
+
+    # region Body
+
+    # The shard owns its generator, so its results do not depend on which process runs it or in which order
+    random_generator = np.random.default_rng(seed_sequence)
+
+    # Prepare matrices filled with 0s for reward sums and optimal action count sums
+    rewards = np.zeros((len(bandits), times))
+    optimal_action_counts = np.zeros((len(bandits), times), dtype=np.int64)
+
+    # For every bandit
+    for i, bandit in enumerate(bandits):
+        # create and initialize a batch of the shard's runs
+        batch = BatchBandit.from_bandit(bandit, shard_runs, random_generator)
+        batch.initialize()
+
+        # for every time step
+        for time in range(times):
+            # select an action in every run
+            actions = batch.act()
+
+            # add up the rewards of all runs
+            rewards[i, time] = batch.step(actions).sum()
+
+            # count the runs in which the selected action is optimal
+            optimal_action_counts[i, time] = np.count_nonzero(actions == batch.optimal_action)
+
+    return optimal_action_counts, rewards
+
+    # endregion Body
+
+
+def simulate(runs, times, bandits, seed=None, workers=None, runs_per_shard=100):
+    # region Summary
+    """
+    Simulate the bandit problems on a process pool. Runs are split into shards of runs_per_shard runs and every shard gets its own
+    np.random.Generator spawned from 1 np.random.SeedSequence, so the result depends only on seed and runs_per_shard, not on workers.
+    :param runs: Number of runs
+    :param times: Number of times
+    :param bandits: Bandit problems (Bandit objects, whose configurations are used)
+    :param seed: Seed of the root np.random.SeedSequence (fresh entropy, if None)
+    :param workers: Number of worker processes (os.cpu_count(), if None; 1 runs the shards in this process)
+    :param runs_per_shard: Number of runs in every shard (the last shard holds the remainder)
+    :return: Optimal action count mean and reward mean, both of shape (len(bandits), times), as returned by the notebook's simulate()
+    """
+    # endregion Summary
+
+    # region Body
+
+    # Split the runs into shards of a fixed size
+    shard_sizes = [min(runs_per_shard, runs - start) for start in range(0, runs, runs_per_shard)]
+
+    # Give every shard its own independent seed
+    seed_sequences = np.random.SeedSequence(seed).spawn(len(shard_sizes))
+
+    workers = os.cpu_count() if workers is None else workers
+
+    arguments = (shard_sizes, [times] * len(shard_sizes), [bandits] * len(shard_sizes), seed_sequences)
+
+    # Simulate the shards (map keeps the results in shard order)
+    if workers == 1:
+        shard_results = list(map(simulate_shard, *arguments))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(shard_sizes))) as executor:
+            shard_results = list(executor.map(simulate_shard, *arguments))
+
+    # Reduce the shard sums in shard order, so that floating-point additions happen in the same order for any number of workers
+    optimal_action_counts = np.zeros((len(bandits), times), dtype=np.int64)
+    rewards = np.zeros((len(bandits), times))
+    for shard_optimal_action_counts, shard_rewards in shard_results:
+        optimal_action_counts += shard_optimal_action_counts
+        rewards += shard_rewards
+
+    return optimal_action_counts / runs, rewards / runs
+
+    # endregion Body
+
+# endregion Functions
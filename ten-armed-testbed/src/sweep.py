@@ -0,0 +1,91 @@
+import itertools
+
+import numpy as np
+
+from .batch_bandit import BatchBandit
+
+# region Fields
+
+# Parameter study of Figure 2.6. For every method: fixed Bandit parameters and the grid of swept parameters (parameter => values).
+figure_2_6_grid = {
+    'ε-greedy': (dict(use_sample_averages=True), dict(epsilon=2.0 ** np.arange(-7, -1))),
+    'gradient bandit': (dict(use_gradient=True, use_gradient_baseline=True), dict(step_size=2.0 ** np.arange(-5, 2))),
+    'UCB': (dict(use_sample_averages=True), dict(confidence_level=2.0 ** np.arange(-4, 3))),
+    'greedy with optimistic initialization α = 0.1': (dict(step_size=0.1), dict(initial_action_value_estimates=2.0 ** np.arange(-2, 3))),
+}
+
+# endregion Fields
+
+# region Functions
+
+def sweep(grid=None, runs=2000, times=1000, arms_number=10, seed=None):
+    # region Summary
+    """
+    Run a parameter study. Every method evaluates all cells of its grid in 1 batch, and every cell is run on the same random
+    bandit problems (the same action values are shared across cells and methods).
+    :param grid: Dictionary: method name => (fixed Bandit parameters, dictionary: swept parameter => values), figure_2_6_grid if None
+    :param runs: Number of runs (shared bandit problems)
+    :param times: Number of times, over which the reward is averaged
+    :param arms_number: (denoted as k) number of bandit's arms
+    :param seed: Seed of the random generator
+    :return: Generator of results table rows: dictionaries with the method, the cell's parameters and the mean reward over the first times steps
+    """
+    # endregion Summary
+
+    # region Body
+
+    grid = figure_2_6_grid if grid is None else grid
+
+    random_generator = np.random.default_rng(seed)
+
+    # Draw the bandit problems once, so that every cell of every method is compared on the same action values
+    shared_action_values = random_generator.standard_normal((runs, arms_number))
+
+    # For every method
+    for method, (fixed_parameters, swept_parameters) in grid.items():
+        # get every cell of the method's grid (cartesian product of the swept values)
+        names = list(swept_parameters)
+        cells = list(itertools.product(*swept_parameters.values()))
+
+        # stack the runs of all cells into 1 batch, the parameters of each cell being repeated for its runs
+        cell_parameters = {name: np.repeat([cell[i] for cell in cells], runs) for i, name in enumerate(names)}
+        batch = BatchBandit(runs=len(cells) * runs, arms_number=arms_number, random_generator=random_generator, **fixed_parameters, **cell_parameters)
+
+        # every cell gets the shared bandit problems
+        batch.initialize(np.tile(shared_action_values, (len(cells), 1)) + batch.true_expected_reward)
+
+        # add up the rewards of every run over all time steps
+        reward_sums = np.zeros(batch.runs)
+        for _ in range(times):
+            reward_sums += batch.step(batch.act())
+
+        # average the rewards over the runs of each cell and over time steps
+        mean_rewards = reward_sums.reshape(len(cells), runs).mean(axis=1) / times
+
+        # stream the method's rows into the results table
+        for cell, mean_reward in zip(cells, mean_rewards):
+            yield dict(method=method, **dict(zip(names, cell)), mean_reward=mean_reward)
+
+    # endregion Body
+
+
+def parameter_study(grid=None, runs=2000, times=1000, arms_number=10, seed=None):
+    # region Summary
+    """
+    Run a parameter study and collect its results table.
+    :param grid: Dictionary: method name => (fixed Bandit parameters, dictionary: swept parameter => values), figure_2_6_grid if None
+    :param runs: Number of runs (shared bandit problems)
+    :param times: Number of times, over which the reward is averaged
+    :param arms_number: (denoted as k) number of bandit's arms
+    :param seed: Seed of the random generator
+    :return: List of results table rows (see sweep())
+    """
+    # endregion Summary
+
+    # region Body
+
+    return list(sweep(grid, runs, times, arms_number, seed))
+
+    # endregion Body
+
+# endregion Functions
@@ -0,0 +1,34 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.bandit import Bandit
+from src.reward_source import ReplayRewardSource
+
+
+def test_replay_is_used_up_in_scalar_bandit():
+    # 3 time steps of a 2-armed recording: the reward of action a at time step t is 2t + a
+    rewards = np.arange(6, dtype=float).reshape(3, 2)
+    bandit = Bandit(arms_number=2, reward_source=ReplayRewardSource(rewards))
+    bandit.initialize()
+
+    assert [bandit.step(0) for _ in range(3)] == [0.0, 2.0, 4.0]
+
+    # Step block_size + 1 does not replay the recording from the start
+    with pytest.raises(IndexError):
+        bandit.step(0)
+
+
+def test_replay_is_used_up_in_batch():
+    source = ReplayRewardSource(np.arange(6, dtype=float).reshape(3, 2))
+    source.initialize(4, 2, np.random.default_rng(0))
+
+    for t in range(3):
+        assert np.array_equal(source.sample(np.ones(4, dtype=np.int64)), np.full(4, 2.0 * t + 1))
+
+    with pytest.raises(IndexError):
+        source.sample(np.zeros(4, dtype=np.int64))
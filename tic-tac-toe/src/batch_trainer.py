@@ -0,0 +1,153 @@
+import numpy as np
+
+# region Functions
+
+def play_batch(graph, values, batch_size: int, epsilon: float, random_generator, keys=None):
+    # region Summary
+    """
+    Play a batch of games in lock-step on the state graph: at every move, all games that are still on pick their next states
+    at once (in lock-step, the player to move is the same in all of them).
+    :param graph: StateGraph
+    :param values: (2, n_states) state value estimations of the 1st and the 2nd player
+    :param batch_size: number of games (denoted as B)
+    :param epsilon: (denoted as ε) the probability to explore
+    :param random_generator: np.random.Generator
+    :param keys: (n_states,) index of the estimation of every state (all states have their own estimation, if None)
+    :return: (B, moves + 1) trajectories of state indices (-1 after the end of a game), (B, moves + 1) whether the move made
+             in each state was exploratory, (B,) winners
+    """
+    # endregion Summary
+
+    # region Body
+
+    moves = graph.successors.shape[1]
+    keys = np.arange(len(graph.hashes)) if keys is None else keys
+
+    # Preallocated trajectories: every game starts from the empty board
+    trajectories = np.full((batch_size, moves + 1), -1, dtype=np.int32)
+    trajectories[:, 0] = graph.initial_state
+    explored = np.zeros((batch_size, moves + 1), dtype=bool)
+
+    playing = np.arange(batch_size)
+    for t in range(moves):
+        playing = playing[~graph.terminal[trajectories[playing, t]]]
+        if playing.size == 0:
+            break
+
+        # Next states of every move (-1 if the position is taken) and their values for the player to move (t-th move)
+        next_states = graph.successors[trajectories[playing, t]]
+        legal = next_states >= 0
+        next_values = np.where(legal, values[t % 2][keys[next_states]], -np.inf)
+
+        # Exploratory move: select randomly (with small probability ε) from among all moves;
+        # greedy move: select randomly from the moves that lead to the state with the greatest estimated value
+        explore = random_generator.random(playing.size) < epsilon
+        candidates = np.where(explore[:, None], legal, next_values == next_values.max(axis=1, keepdims=True))
+
+        # The candidate with the greatest random key is a uniform choice among the candidates
+        positions = np.argmax(np.where(candidates, random_generator.random(candidates.shape), -1), axis=1)
+
+        trajectories[playing, t + 1] = next_states[np.arange(playing.size), positions]
+        explored[playing, t] = explore
+
+    # The game ends in the last state of every trajectory
+    lengths = np.sum(trajectories >= 0, axis=1)
+    winners = graph.winner[trajectories[np.arange(batch_size), lengths - 1]]
+
+    return trajectories, explored, winners
+
+    # endregion Body
+
+def update_state_value_estimates(values, trajectories, explored, step_size: float, keys=None):
+    # region Summary
+    """
+    Apply the temporal-difference backups of a batch of games in bulk, in reverse order of moves:
+    𝑉(𝑆_𝑡) = 𝑉(𝑆_𝑡) + 𝛼(𝑉(𝑆_(𝑡 + 1)) − 𝑉(𝑆_𝑡)), for the games in which the move made in 𝑆_𝑡 was greedy (as
+    RLPlayer.update_state_value_estimates(): a player's estimation is skipped only where that player explored).
+    A state visited by several games at the same move receives 1 update with their average temporal-difference error.
+    :param values: (2, n_states) state value estimations of the 1st and the 2nd player (updated in place)
+    :param trajectories: (B, moves + 1) trajectories of state indices, as returned by play_batch()
+    :param explored: (B, moves + 1) whether the move made in each state was exploratory
+    :param step_size: (denoted as 𝛼) the step size to update estimations
+    :param keys: (n_states,) index of the estimation of every state (all states have their own estimation, if None)
+    """
+    # endregion Summary
+
+    # region Body
+
+    keys = np.arange(values.shape[1]) if keys is None else keys
+
+    for t in reversed(range(trajectories.shape[1] - 1)):
+        # Games that went on after the t-th state
+        going_on = trajectories[:, t + 1] >= 0
+        states = keys[trajectories[going_on, t]]
+        next_states = keys[trajectories[going_on, t + 1]]
+
+        for player in range(2):
+            # Only the player to move (t-th move) can have explored
+            greedy = ~explored[going_on, t] if t % 2 == player else np.ones(states.size, dtype=bool)
+
+            temporal_difference_errors = values[player, next_states[greedy]] - values[player, states[greedy]]
+
+            # Average temporal-difference error of every state
+            sums = np.bincount(states[greedy], weights=temporal_difference_errors, minlength=values.shape[1])
+            counts = np.bincount(states[greedy], minlength=values.shape[1])
+            average_errors = np.divide(sums, counts, out=np.zeros(values.shape[1]), where=counts > 0)
+
+            values[player] += step_size * average_errors
+
+    # endregion Body
+
+def train_batch(graph, epochs: int, batch_size: int = 1000, step_size: float = 0.1, epsilon: float = 0.1, print_every_n: int = 500,
+                use_symmetry: bool = False, random_generator=None):
+    # region Summary
+    """
+    Train 2 RL players by self-play in batches of games played in lock-step (as state_graph.train_on_graph(), with the values
+    updated after every batch instead of after every game).
+    :param graph: StateGraph
+    :param epochs: number of epochs (games) for training
+    :param batch_size: number of games played in lock-step (denoted as B)
+    :param step_size: (denoted as 𝛼) the step size to update estimations
+    :param epsilon: (denoted as ε) the probability to explore
+    :param print_every_n: number of epochs to print the intermediate win rate (checked after every batch)
+    :param use_symmetry: if True, learn on canonical states only: all rotations and reflections of a board share 1 estimation
+    :param random_generator: np.random.Generator (a fresh one, if None)
+    :return: (2, n_states) state value estimations of the 1st and the 2nd player, number of wins of the 1st and the 2nd player
+    """
+    # endregion Summary
+
+    # region Body
+
+    random_generator = np.random.default_rng() if random_generator is None else random_generator
+
+    # Index of the estimation of every state
+    keys = graph.canonical if use_symmetry else np.arange(len(graph.hashes))
+
+    # State value estimations (denoted as 𝑉(𝑆)) of both players
+    values = np.stack([graph.initial_values(1), graph.initial_values(-1)])
+
+    # Set the initial win rate of both players to 0
+    wins = [0, 0]
+
+    for start in range(0, epochs, batch_size):
+        size = min(batch_size, epochs - start)
+
+        trajectories, explored, winners = play_batch(graph, values, size, epsilon, random_generator, keys)
+
+        # check which player is the winner
+        wins[0] += int(np.sum(winners == 1))
+        wins[1] += int(np.sum(winners == -1))
+
+        # print the intermediate win rates, if needed (once for every multiple of print_every_n reached by the batch)
+        if (start + size) // print_every_n > start // print_every_n:
+            print(f'epoch n:{start + size}, win rate player 1:{wins[0]}, win rate player 2:{wins[1]}')
+
+        # update value estimates of both players
+        update_state_value_estimates(values, trajectories, explored, step_size, keys)
+
+    # Symmetric states take the estimation of their canonical representative
+    return values[:, keys], wins
+
+    # endregion Body
+
+# endregion Functions
@@ -0,0 +1,316 @@
+import numpy as np
+
+from state import calculate_canonical_hash_value
+
+# region Fields
+
+# Masks of the winning lines (rows, columns and diagonals) of every board size, built on demand by get_line_masks()
+line_masks = dict()
+
+# endregion Fields
+
+# region Functions
+
+def get_line_masks(rows: int = 3, columns: int = 3):
+    # region Summary
+    """
+    Get the bit masks of the lines that win the game: every row, every column and, on square boards, both diagonals.
+    Position (i, j) is bit i * columns + j.
+    :param rows: number of board's rows
+    :param columns: number of board's columns
+    :return: tuple of line masks
+    """
+    # endregion Summary
+
+    # region Body
+
+    if (rows, columns) not in line_masks:
+        masks = []
+
+        # Rows
+        for i in range(rows):
+            masks.append(sum(1 << (i * columns + j) for j in range(columns)))
+
+        # Columns
+        for j in range(columns):
+            masks.append(sum(1 << (i * columns + j) for i in range(rows)))
+
+        # Diagonals
+        if rows == columns:
+            masks.append(sum(1 << (i * columns + i) for i in range(rows)))
+            masks.append(sum(1 << (i * columns + columns - 1 - i) for i in range(rows)))
+
+        line_masks[(rows, columns)] = tuple(masks)
+
+    return line_masks[(rows, columns)]
+
+    # endregion Body
+
+# endregion Functions
+
+
+class BitboardState:
+    # Instances are created for every state and every move: keep them small
+    __slots__ = ('board_rows', 'board_columns', 'board_size', 'first_player_bits', 'second_player_bits',
+                 'winner', 'hash_value', 'canonical_hash_value', 'game_ended', 'board_data')
+
+    # region Constructor
+
+    def __init__(self, rows: int = 3, columns: int = 3):
+        # region Summary
+        """
+        State of the game (denoted as 𝑆), with the same public methods as State, backed by 2 bitboards: bit i * columns + j of
+        first_player_bits (second_player_bits) is set, if the player who moves first (another player) put his symbol in position (i, j).
+        :param rows: number of board's rows
+        :param columns: number of board's columns
+        """
+        # endregion Summary
+
+        # region Body
+
+        self.board_rows = rows
+        self.board_columns = columns
+        self.board_size = self.board_rows * self.board_columns
+
+        # At the beginning of the game, the board is empty
+        self.first_player_bits = 0
+        self.second_player_bits = 0
+
+        # Player that won the game
+        self.winner = None
+
+        # Unique hash value for state, the same as State.calculate_hash_value(): each position (in row-major order) is a
+        # base-3 digit, symbol + 1. The empty board has all digits equal to 1.
+        self.hash_value = (3 ** self.board_size - 1) // 2
+
+        # Hash value of the representative of the state's symmetry class
+        self.canonical_hash_value = None
+
+        # True, if the game ended; otherwise, false
+        self.game_ended = None
+
+        # Board as an array (built on demand by the data property)
+        self.board_data = None
+
+        # endregion Body
+
+    # endregion Constructor
+
+    # region Functions
+
+    @property
+    def data(self):
+        # region Summary
+        """
+        The board as an n * n array, as State.data: 0 represents an empty position, 1 the player who moves first, -1 another player.
+        :return: board
+        """
+        # endregion Summary
+
+        # region Body
+
+        if self.board_data is None:
+            self.board_data = np.zeros(self.board_size)
+            for position in range(self.board_size):
+                if self.first_player_bits >> position & 1:
+                    self.board_data[position] = 1
+                elif self.second_player_bits >> position & 1:
+                    self.board_data[position] = -1
+            self.board_data = self.board_data.reshape(self.board_rows, self.board_columns)
+
+        return self.board_data
+
+        # endregion Body
+
+    def get_empty_positions(self):
+        # region Summary
+        """
+        Get the bit mask of empty positions (the legal moves).
+        :return: bit mask of empty positions
+        """
+        # endregion Summary
+
+        # region Body
+
+        return ~(self.first_player_bits | self.second_player_bits) & ((1 << self.board_size) - 1)
+
+        # endregion Body
+
+    def calculate_hash_value(self):
+        # region Summary
+        """
+        Get the unique hash value for state (updated incrementally on every move).
+        :return: hash value
+        """
+        # endregion Summary
+
+        # region Body
+
+        return self.hash_value
+
+        # endregion Body
+
+    def calculate_canonical_hash_value(self):
+        # region Summary
+        """
+        Calculates the hash value of the state's canonical representative (as State.calculate_canonical_hash_value()).
+        :return: canonical hash value
+        """
+        # endregion Summary
+
+        # region Body
+
+        if self.canonical_hash_value is None:
+            self.canonical_hash_value = calculate_canonical_hash_value(self.data)
+        return self.canonical_hash_value
+
+        # endregion Body
+
+    def is_game_ended(self):
+        # region Summary
+        """
+        Checks whether a player has won the game, or it's a tie.
+        :return: True, if the game ended; otherwise, False
+        """
+        # endregion Summary
+
+        # region Body
+
+        if self.game_ended is not None:
+            return self.game_ended
+
+        # Check win: a player owns all positions of a line
+        for mask in get_line_masks(self.board_rows, self.board_columns):
+            if self.first_player_bits & mask == mask:
+                self.winner = 1
+                self.game_ended = True
+                return self.game_ended
+            if self.second_player_bits & mask == mask:
+                self.winner = -1
+                self.game_ended = True
+                return self.game_ended
+
+        # Check tie: no empty position is left
+        if self.get_empty_positions() == 0:
+            self.winner = 0
+            self.game_ended = True
+            return self.game_ended
+
+        # Otherwise, the game is still on
+        self.game_ended = False
+        return self.game_ended
+
+        # endregion Body
+
+    def get_next_state(self, i, j, symbol):
+        # region Summary
+        """
+        Get the next state by putting player's symbol in position (i, j).
+        :param i: position's row number
+        :param j: position's column number
+        :param symbol: 1 or -1
+        :return: next state
+        """
+        # endregion Summary
+
+        # region Body
+
+        position = int(i) * self.board_columns + int(j)
+
+        # Create the next state
+        next_state = BitboardState(self.board_rows, self.board_columns)
+
+        # Copy the previous state's bitboards into the next state and set the symbol's bit at (i, j) position
+        next_state.first_player_bits = self.first_player_bits
+        next_state.second_player_bits = self.second_player_bits
+        if symbol == 1:
+            next_state.first_player_bits |= 1 << position
+        else:
+            next_state.second_player_bits |= 1 << position
+
+        # The digit of (i, j) position changes from 1 (empty) to symbol + 1
+        next_state.hash_value = self.hash_value + int(symbol) * 3 ** (self.board_size - 1 - position)
+
+        return next_state
+
+        # endregion Body
+
+    def print_state(self):
+        # region Summary
+        """
+        Print the current state of the board
+        """
+        # endregion Summary
+
+        # region Body
+
+        for i in range(self.board_rows):
+            print('-------------')
+            out = '| '
+            for j in range(self.board_columns):
+                position = i * self.board_columns + j
+                if self.first_player_bits >> position & 1:
+                    symbol = '*'
+                elif self.second_player_bits >> position & 1:
+                    symbol = 'x'
+                else:
+                    symbol = '0'
+                out += symbol + ' | '
+            print(out)
+        print('-------------')
+
+        # endregion Body
+
+    # endregion Functions
+
+
+def _get_all_states(current_state, current_symbol, all_states):
+    # region Summary
+    """
+    Private function for getting all states
+    :param current_state: Current state
+    :param current_symbol: Current symbol
+    :param all_states: Dictionary of all states
+    """
+    # endregion Summary
+
+    # region Body
+
+    empty_positions = current_state.get_empty_positions()
+
+    while empty_positions:
+        # Take the lowest empty position
+        position = (empty_positions & -empty_positions).bit_length() - 1
+        empty_positions &= empty_positions - 1
+
+        new_state = current_state.get_next_state(position // current_state.board_columns, position % current_state.board_columns, current_symbol)
+        new_hash = new_state.hash_value
+        if new_hash not in all_states:
+            is_end = new_state.is_game_ended()
+            all_states[new_hash] = (new_state, is_end)
+            if not is_end:
+                _get_all_states(new_state, -current_symbol, all_states)
+
+    # endregion Body
+
+
+def get_all_states(rows: int = 3, columns: int = 3):
+    # region Summary
+    """
+    Public function for getting all states (as state.get_all_states(), with bitboard states)
+    :param rows: Number of board's rows
+    :param columns: Number of board's columns
+    :return: dictionary of all states
+    """
+    # endregion Summary
+
+    # region Body
+
+    current_symbol = 1
+    current_state = BitboardState(rows, columns)
+    all_states = dict()
+    all_states[current_state.calculate_hash_value()] = (current_state, current_state.is_game_ended())
+    _get_all_states(current_state, current_symbol, all_states)
+    return all_states
+
+    # endregion Body
@@ -0,0 +1,550 @@
+from collections import OrderedDict
+
+import numpy as np
+
+# region Fields
+
+# Directions of the lines through a position: horizontal, vertical, main diagonal, secondary diagonal
+directions = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+# endregion Fields
+
+class ZobristTable:
+    # region Constructor
+
+    def __init__(self, rows: int, columns: int, random_generator=None):
+        # region Summary
+        """
+        Zobrist keys of an m,n-board: the hash value of a board is the XOR of the keys of its (symbol, position) pairs,
+        so a move updates it with a single XOR.
+        :param rows: number of board's rows
+        :param columns: number of board's columns
+        :param random_generator: np.random.Generator (a fresh one, if None)
+        """
+        # endregion Summary
+
+        # region Body
+
+        random_generator = np.random.default_rng() if random_generator is None else random_generator
+
+        # Random 64-bit keys of the 1st player's (index 0) and another player's (index 1) symbols in every position
+        self.keys = random_generator.integers(0, 2 ** 63, size=(2, rows * columns), dtype=np.int64).tolist()
+
+        # endregion Body
+
+    # endregion Constructor
+
+    # region Functions
+
+    def key(self, position, symbol):
+        # region Summary
+        """
+        Get the key of a symbol in a position.
+        :param position: position (i * columns + j)
+        :param symbol: 1 or -1
+        :return: key
+        """
+        # endregion Summary
+
+        # region Body
+
+        return self.keys[0 if symbol == 1 else 1][position]
+
+        # endregion Body
+
+    # endregion Functions
+
+
+class MNKState:
+    # Instances are created lazily, on the 1st visit of every state: keep them small
+    __slots__ = ('board_rows', 'board_columns', 'k', 'zobrist_table', 'board', 'hash_value', 'moves', 'winner', 'game_ended')
+
+    # region Constructor
+
+    def __init__(self, rows: int, columns: int, k: int, zobrist_table):
+        # region Summary
+        """
+        State of an m,n,k-game (denoted as 𝑆): players put their symbols on an m * n board in turn, and the 1st player
+        who gets k symbols in a row (horizontally, vertically or diagonally) wins.
+        :param rows: number of board's rows (m)
+        :param columns: number of board's columns (n)
+        :param k: number of symbols in a row that win the game
+        :param zobrist_table: ZobristTable of the board
+        """
+        # endregion Summary
+
+        # region Body
+
+        self.board_rows = rows
+        self.board_columns = columns
+        self.k = k
+        self.zobrist_table = zobrist_table
+
+        # At the beginning of the game, the board is empty <=> it is filled with 0s (row-major list)
+        self.board = [0] * (rows * columns)
+
+        # Zobrist hash value of the board (0 for the empty board)
+        self.hash_value = 0
+
+        # Number of symbols on the board
+        self.moves = 0
+
+        # Player that won the game
+        self.winner = None
+
+        # True, if the game ended; otherwise, false
+        self.game_ended = False
+
+        # endregion Body
+
+    # endregion Constructor
+
+    # region Functions
+
+    def get_empty_positions(self):
+        # region Summary
+        """
+        Get the empty positions (the legal moves).
+        :return: list of positions (i * columns + j)
+        """
+        # endregion Summary
+
+        # region Body
+
+        return [position for position, symbol in enumerate(self.board) if symbol == 0]
+
+        # endregion Body
+
+    def is_winning_move(self, position, symbol):
+        # region Summary
+        """
+        Check whether putting a symbol in a position wins the game, scanning only the lines through that position.
+        :param position: position (i * columns + j)
+        :param symbol: 1 or -1
+        :return: True, if the move makes k symbols in a row; otherwise, False
+        """
+        # endregion Summary
+
+        # region Body
+
+        i, j = divmod(position, self.board_columns)
+
+        for di, dj in directions:
+            # Count the move's symbol and the same symbols next to it in both directions of the line
+            count = 1
+            for sign in (1, -1):
+                r, c = i + sign * di, j + sign * dj
+                while 0 <= r < self.board_rows and 0 <= c < self.board_columns and self.board[r * self.board_columns + c] == symbol:
+                    count += 1
+                    r, c = r + sign * di, c + sign * dj
+
+            if count >= self.k:
+                return True
+
+        return False
+
+        # endregion Body
+
+    def get_next_hash_value(self, position, symbol):
+        # region Summary
+        """
+        Get the hash value of the next state, without creating it.
+        :param position: position (i * columns + j)
+        :param symbol: 1 or -1
+        :return: hash value of the next state
+        """
+        # endregion Summary
+
+        # region Body
+
+        return self.hash_value ^ self.zobrist_table.key(position, symbol)
+
+        # endregion Body
+
+    def get_next_state(self, position, symbol):
+        # region Summary
+        """
+        Get the next state by putting player's symbol in a position.
+        :param position: position (i * columns + j)
+        :param symbol: 1 or -1
+        :return: next state
+        """
+        # endregion Summary
+
+        # region Body
+
+        next_state = MNKState(self.board_rows, self.board_columns, self.k, self.zobrist_table)
+        next_state.board = self.board.copy()
+        next_state.board[position] = symbol
+        next_state.hash_value = self.get_next_hash_value(position, symbol)
+        next_state.moves = self.moves + 1
+
+        # Only the lines through the last move can have been completed
+        if self.is_winning_move(position, symbol):
+            next_state.winner = symbol
+            next_state.game_ended = True
+
+        # Check tie
+        elif next_state.moves == len(self.board):
+            next_state.winner = 0
+            next_state.game_ended = True
+
+        return next_state
+
+        # endregion Body
+
+    def print_state(self):
+        # region Summary
+        """
+        Print the current state of the board
+        """
+        # endregion Summary
+
+        # region Body
+
+        for i in range(self.board_rows):
+            print('----' * self.board_columns + '-')
+            out = '| '
+            for j in range(self.board_columns):
+                symbol = self.board[i * self.board_columns + j]
+                out += ('*' if symbol == 1 else 'x' if symbol == -1 else '0') + ' | '
+            print(out)
+        print('----' * self.board_columns + '-')
+
+        # endregion Body
+
+    # endregion Functions
+
+
+class LRUValueTable:
+    # region Constructor
+
+    def __init__(self, capacity: int = 1000000, default_value: float = 0.5):
+        # region Summary
+        """
+        Size-bounded table of state value estimations: when it is full, the least recently used estimation is evicted
+        (and the state falls back to the default value, if it is visited again).
+        :param capacity: maximum number of estimations
+        :param default_value: estimation of states that are not in the table
+        """
+        # endregion Summary
+
+        # region Body
+
+        self.capacity = capacity
+        self.default_value = default_value
+
+        # Estimations in order of use (the least recently used 1st)
+        self.values = OrderedDict()
+
+        # endregion Body
+
+    # endregion Constructor
+
+    # region Functions
+
+    def __len__(self):
+        return len(self.values)
+
+    def get(self, hash_value):
+        # region Summary
+        """
+        Get the estimation of a state.
+        :param hash_value: hash value of the state
+        :return: estimation
+        """
+        # endregion Summary
+
+        # region Body
+
+        if hash_value not in self.values:
+            return self.default_value
+
+        self.values.move_to_end(hash_value)
+        return self.values[hash_value]
+
+        # endregion Body
+
+    def set(self, hash_value, value):
+        # region Summary
+        """
+        Set the estimation of a state, evicting the least recently used estimation if the table is full.
+        :param hash_value: hash value of the state
+        :param value: estimation
+        """
+        # endregion Summary
+
+        # region Body
+
+        self.values[hash_value] = value
+        self.values.move_to_end(hash_value)
+
+        if len(self.values) > self.capacity:
+            self.values.popitem(last=False)
+
+        # endregion Body
+
+    # endregion Functions
+
+
+class MNKPlayer:
+    # region Constructor
+
+    def __init__(self, step_size=0.1, epsilon=0.1, capacity: int = 1000000, random_generator=None):
+        # region Summary
+        """
+        Reinforcement Learning Player of m,n,k-games (as RLPlayer), with state value estimations held in a size-bounded table
+        keyed by Zobrist hash values instead of a table of all states.
+        :param step_size: (denoted as 𝛼) the step size to update estimations
+        :param epsilon: (denoted as ε) the probability to explore
+        :param capacity: maximum number of state value estimations
+        :param random_generator: np.random.Generator (a fresh one, if None)
+        """
+        # endregion Summary
+
+        # region Body
+
+        self.step_size = step_size
+        self.epsilon = epsilon
+        self.random_generator = np.random.default_rng() if random_generator is None else random_generator
+
+        # State value estimations (denoted as 𝑉(𝑆)) of states that are still on
+        self.state_value_estimations = LRUValueTable(capacity)
+
+        # The states in which the agent appears during the game
+        self.acquired_states = []
+
+        # Boolean list indicating whether the action chosen in a given state is greedy or not
+        self.greedy = []
+
+        # RL player's symbol
+        self.symbol = 0
+
+        # endregion Body
+
+    # endregion Constructor
+
+    # region Functions
+
+    def reset(self):
+        # region Summary
+        """
+        Reset RL player
+        """
+        # endregion Summary
+
+        # region Body
+
+        self.acquired_states = []
+        self.greedy = []
+
+        # endregion Body
+
+    def set_state(self, state):
+        # region Summary
+        """
+        Set state.
+        :param state: state
+        """
+        # endregion Summary
+
+        # region Body
+
+        self.acquired_states.append(state)
+        self.greedy.append(True)
+
+        # endregion Body
+
+    def set_symbol(self, symbol):
+        # region Summary
+        """
+        Set RL player's symbol.
+        :param symbol: symbol of RL player
+        """
+        # endregion Summary
+
+        # region Body
+
+        self.symbol = symbol
+
+        # endregion Body
+
+    def get_value(self, state):
+        # region Summary
+        """
+        Get the estimation of a state: 1 if RL player won, 0.5 for a tie, 0 if RL player lost, the learned estimation otherwise.
+        :param state: state
+        :return: estimation
+        """
+        # endregion Summary
+
+        # region Body
+
+        if state.game_ended:
+            return 1.0 if state.winner == self.symbol else 0.5 if state.winner == 0 else 0.0
+
+        return self.state_value_estimations.get(state.hash_value)
+
+        # endregion Body
+
+    def update_state_value_estimates(self):
+        # region Summary
+        """
+        If a greedy action was selected in a given state, update state value estimations according to the equation:
+        𝑉(𝑆_𝑡) = 𝑉(𝑆_𝑡) + 𝛼(𝑉(𝑆_(𝑡 + 1)) − 𝑉(𝑆_𝑡)) (temporal-difference learning method)
+        """
+        # endregion Summary
+
+        # region Body
+
+        for t in reversed(range(len(self.acquired_states) - 1)):
+            if self.greedy[t]:
+                value = self.get_value(self.acquired_states[t])
+                temporal_difference_error = self.get_value(self.acquired_states[t + 1]) - value
+                self.state_value_estimations.set(self.acquired_states[t].hash_value, value + self.step_size * temporal_difference_error)
+
+        # endregion Body
+
+    def act(self):
+        # region Summary
+        """
+        Choose an action based on state. Next states are evaluated by their hash values, without being created.
+        :return: action: position, symbol
+        """
+        # endregion Summary
+
+        # region Body
+
+        # Get the current state
+        current_state = self.acquired_states[-1]
+
+        positions = current_state.get_empty_positions()
+
+        # Exploratory move: select randomly (with small probability ε) from among all moves
+        if self.random_generator.random() < self.epsilon:
+            self.greedy[-1] = False
+            return positions[self.random_generator.integers(len(positions))], self.symbol
+
+        # Greedy move: select the move that leads to the state with the greatest estimated value
+        values = []
+        for position in positions:
+            # a winning move ends the game; a move that fills the board is a tie; otherwise, look the next state up
+            if current_state.is_winning_move(position, self.symbol):
+                values.append(1.0)
+            elif current_state.moves + 1 == len(current_state.board):
+                values.append(0.5)
+            else:
+                values.append(self.state_value_estimations.get(current_state.get_next_hash_value(position, self.symbol)))
+
+        # Select randomly from one of the actions with equal values
+        best_value = max(values)
+        best_positions = [position for position, value in zip(positions, values) if value == best_value]
+
+        return best_positions[self.random_generator.integers(len(best_positions))], self.symbol
+
+        # endregion Body
+
+    # endregion Functions
+
+
+def play(player1, player2, rows: int, columns: int, k: int, zobrist_table):
+    # region Summary
+    """
+    Play an m,n,k-game (as Judge.play()): states are created only along the game's path.
+    :param player1: The player who moves first (symbol = 1)
+    :param player2: Another player (symbol = -1)
+    :param rows: number of board's rows (m)
+    :param columns: number of board's columns (n)
+    :param k: number of symbols in a row that win the game
+    :param zobrist_table: ZobristTable of the board
+    :return: the winner player, when game ends
+    """
+    # endregion Summary
+
+    # region Body
+
+    player1.reset()
+    player2.reset()
+
+    current_state = MNKState(rows, columns, k, zobrist_table)
+
+    # Set the players' state to current state
+    player1.set_state(current_state)
+    player2.set_state(current_state)
+
+    player = player1
+    while not current_state.game_ended:
+        # Make an action
+        position, symbol = player.act()
+
+        # Get the next state
+        current_state = current_state.get_next_state(position, symbol)
+
+        # Set the current state for both players
+        player1.set_state(current_state)
+        player2.set_state(current_state)
+
+        # Alternate players
+        player = player2 if player is player1 else player1
+
+    return current_state.winner
+
+    # endregion Body
+
+
+def train(rows: int, columns: int, k: int, epochs: int, step_size: float = 0.1, epsilon: float = 0.01, capacity: int = 1000000,
+          print_every_n: int = 500, random_generator=None):
+    # region Summary
+    """
+    Train 2 RL players of an m,n,k-game by self-play (e.g. 4 × 4 with k = 3, 5 × 5 with k = 4).
+    :param rows: number of board's rows (m)
+    :param columns: number of board's columns (n)
+    :param k: number of symbols in a row that win the game
+    :param epochs: number of epochs for training
+    :param step_size: (denoted as 𝛼) the step size to update estimations
+    :param epsilon: (denoted as ε) the probability to explore
+    :param capacity: maximum number of state value estimations of every player
+    :param print_every_n: number of epochs to print the intermediate win rate
+    :param random_generator: np.random.Generator (a fresh one, if None)
+    :return: both trained players
+    """
+    # endregion Summary
+
+    # region Body
+
+    random_generator = np.random.default_rng() if random_generator is None else random_generator
+
+    zobrist_table = ZobristTable(rows, columns, random_generator)
+
+    # Create 2 RL players
+    player1 = MNKPlayer(step_size, epsilon, capacity, random_generator)
+    player2 = MNKPlayer(step_size, epsilon, capacity, random_generator)
+    player1.set_symbol(1)
+    player2.set_symbol(-1)
+
+    # Set the initial win rate of both players to 0
+    player1_win_rate = 0
+    player2_win_rate = 0
+
+    for epoch in range(1, 1 + epochs):
+        # get the winner
+        winner = play(player1, player2, rows, columns, k, zobrist_table)
+
+        # check which player is the winner
+        if winner == 1:
+            player1_win_rate += 1
+        if winner == -1:
+            player2_win_rate += 1
+
+        # print the intermediate win rates, if needed
+        if epoch % print_every_n == 0:
+            print(f'epoch n:{epoch}, win rate player 1:{player1_win_rate}, win rate player 2:{player2_win_rate}, '
+                  f'estimations: {len(player1.state_value_estimations)}, {len(player2.state_value_estimations)}')
+
+        # update value estimates of both players
+        player1.update_state_value_estimates()
+        player2.update_state_value_estimates()
+
+    return player1, player2
+
+    # endregion Body
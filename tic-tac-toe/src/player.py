@@ -1,16 +1,21 @@
 import numpy as np
-import pickle
+
+import policy_store
+from solver import get_solution
+from state_graph import get_state_graph
 
 class RLPlayer:
     # region Constructor
 
-    def __init__(self, all_states, step_size=0.1, epsilon=0.1):
+    def __init__(self, all_states, step_size=0.1, epsilon=0.1, use_symmetry: bool = False, graph=None):
         # region Summary
         """
         Reinforcement Learning Player
         :param all_states: dictionary of all states
         :param step_size: (denoted as 𝛼) the step size to update estimations
         :param epsilon: (denoted as ε) the probability to explore
+        :param use_symmetry: if True, learn on canonical states only: all rotations and reflections of a board share 1 estimation
+        :param graph: StateGraph of the states (state_graph.get_state_graph() of the board size of all_states, if None)
         """
         # endregion Summary
 
@@ -19,6 +24,7 @@ class RLPlayer:
         self.all_states = all_states
         self.step_size = step_size
         self.epsilon = epsilon
+        self.use_symmetry = use_symmetry
 
         # State value estimations (denoted as 𝑉(𝑆))
         self.state_value_estimations = dict()
@@ -32,6 +38,16 @@ class RLPlayer:
         # RL player's symbol
         self.symbol = 0
 
+        # Number of epochs (games) trained
+        self.epochs = 0
+
+        # Successor index: for every state, the moves (row, column) and the keys of their next states in the state value estimations
+        state, _ = next(iter(all_states.values()))
+        self.graph = get_state_graph(state.board_rows, state.board_columns) if graph is None else graph
+        self.next_moves = [[divmod(position, state.board_columns) for position, next_state in enumerate(row) if next_state >= 0]
+                           for row in self.graph.successors.tolist()]
+        self.next_keys = self.get_next_keys()
+
         # endregion Body
 
     # endregion Constructor
@@ -52,6 +68,37 @@ class RLPlayer:
 
         # endregion Body
 
+    def get_next_keys(self):
+        # region Summary
+        """
+        Get the keys of the next states of every state in the state value estimations.
+        :return: list of lists of keys (canonical hash values, if symmetries are used; otherwise, hash values)
+        """
+        # endregion Summary
+
+        # region Body
+
+        keys = (self.graph.hashes[self.graph.canonical] if self.use_symmetry else self.graph.hashes).tolist()
+
+        return [[keys[next_state] for next_state in row if next_state >= 0] for row in self.graph.successors.tolist()]
+
+        # endregion Body
+
+    def get_key(self, state):
+        # region Summary
+        """
+        Get the key of a state in the state value estimations.
+        :param state: state
+        :return: canonical hash value, if symmetries are used; otherwise, hash value
+        """
+        # endregion Summary
+
+        # region Body
+
+        return state.calculate_canonical_hash_value() if self.use_symmetry else state.calculate_hash_value()
+
+        # endregion Body
+
     def set_state(self, state):
         # region Summary
         """
@@ -82,6 +129,10 @@ class RLPlayer:
         for hash_value in self.all_states:
             state, game_ended = self.all_states[hash_value]
 
+            # Symmetric states share the estimation of their canonical representative
+            if self.use_symmetry and state.calculate_canonical_hash_value() != hash_value:
+                continue
+
             if game_ended:
                 # Check RL player's winning
                 if state.winner == self.symbol:
@@ -111,12 +162,14 @@ class RLPlayer:
 
         # region Body
 
-        states = [state.calculate_hash_value() for state in self.acquired_states]
+        states = [self.get_key(state) for state in self.acquired_states]
 
         for t in reversed(range(len(states) - 1)):
             temporal_difference_error = self.greedy[t] * (self.state_value_estimations[states[t + 1]] - self.state_value_estimations[states[t]])
             self.state_value_estimations[states[t]] += self.step_size * temporal_difference_error
 
+        self.epochs += 1
+
         # endregion Body
 
     def act(self, rows: int = 3, columns: int = 3):
@@ -131,79 +184,122 @@ class RLPlayer:
 
         # region Body
 
-        # Get the current state
-        current_state = self.acquired_states[-1]
-
-        # Create an empty lists for next states and positions that are possible from the current state
-        next_states = []
-        next_positions = []
-
-        for i in range(rows):
-            for j in range(columns):
-                # If the (i, j) cell is empty
-                if current_state.data[i, j] == 0:
-                    # consider that cell for the next position
-                    next_positions.append([i, j])
-
-                    # get the next state given the RL player's symbol was put in position (i, j)
-                    next_state = current_state.get_next_state(i, j, self.symbol)
-
-                    # calculate the hash value of acquired state
-                    next_states.append(next_state.calculate_hash_value())
+        # Get the current state's moves and the keys of the next states they lead to (from the successor index)
+        current_state = self.graph.indices[self.acquired_states[-1].calculate_hash_value()]
+        next_moves = self.next_moves[current_state]
 
         # Exploratory move: select randomly (with small probability ε) from among the non-greedy moves instead of selecting greedy move
         if np.random.rand() < self.epsilon:
-            action = next_positions[np.random.randint(len(next_positions))]
-            action.append(self.symbol)
+            i, j = next_moves[np.random.randint(len(next_moves))]
             self.greedy[-1] = False
-            return action
+            return [i, j, self.symbol]
 
         # Greedy move: select the move that leads to the state with the greatest estimated value <=> the highest estimated probability of winning
-        actions = []
-        for hash_value, position in zip(next_states, next_positions):
-            actions.append((self.state_value_estimations[hash_value], position))
+        values = [self.state_value_estimations[key] for key in self.next_keys[current_state]]
+        best_value = max(values)
 
         # Select randomly from one of the actions with equal values
-        np.random.shuffle(actions) #???
+        best_moves = [move for move, value in zip(next_moves, values) if value == best_value]
+        i, j = best_moves[np.random.randint(len(best_moves))] if len(best_moves) > 1 else best_moves[0]
 
-        # Sort the actions in descending order according to the state value estimations
-        actions.sort(key=lambda a: a[0], reverse=True)
+        return [i, j, self.symbol]
+
+        # endregion Body
 
-        # Select the position with the highest state value estimation
-        action = actions[0][1]
+    def get_policy_path(self, path=None):
+        # region Summary
+        """
+        Get the path of the policy.
+        :param path: path of the policy, without extension (policy_first / policy_second in the current directory, if None)
+        :return: path of the policy
+        """
+        # endregion Summary
 
-        # Append the RL player's symbol to the action
-        action.append(self.symbol)
+        # region Body
 
-        return action
+        return 'policy_%s' % ('first' if self.symbol == 1 else 'second') if path is None else path
 
         # endregion Body
 
-    def save_policy(self):
+    def save_policy(self, path=None):
         # region Summary
         """
-        Save policy
+        Save policy (see policy_store.save_policy())
+        :param path: path of the policy, without extension (policy_first / policy_second in the current directory, if None)
         """
         # endregion Summary
 
         # region Body
 
-        with open('policy_%s.bin' % ('first' if self.symbol == 1 else 'second'), 'wb') as f:
-            pickle.dump(self.state_value_estimations, f)
+        # Board size of the states
+        state, _ = next(iter(self.all_states.values()))
+
+        policy_store.save_policy(self.get_policy_path(path), self.state_value_estimations, state.board_rows, state.board_columns,
+                                 self.symbol, self.step_size, self.epsilon, self.epochs, self.use_symmetry)
 
         # endregion Body
 
-    def load_policy(self):
+    def load_policy(self, path=None):
         # region Summary
         """
-        Load policy
+        Load policy (memory-mapped, see policy_store.load_policy()). A policy saved with symmetries holds canonical states only,
+        so the player then looks up the canonical hash values of the states.
+        :param path: path of the policy, without extension (policy_first / policy_second in the current directory, if None)
         """
         # endregion Summary
 
         # region Body
 
-        with open('policy_%s.bin' % ('first' if self.symbol == 1 else 'second'), 'rb') as f:
-            self.state_value_estimations = pickle.load(f)
+        header, self.state_value_estimations = policy_store.load_policy(self.get_policy_path(path))
+        self.epochs = header['epochs']
+
+        if header['use_symmetry'] != self.use_symmetry:
+            self.use_symmetry = header['use_symmetry']
+            self.next_keys = self.get_next_keys()
+
+        # endregion Body
+
+    # endregion Functions
+
+
+class PolicyPlayer(RLPlayer):
+    # region Constructor
+
+    def __init__(self, all_states, first_path='policy_first', second_path='policy_second'):
+        # region Summary
+        """
+        Greedy RL player (ε = 0) following saved policies: 1 for each seat, loaded when the symbol is set.
+        :param all_states: dictionary of all states
+        :param first_path: path of the policy played as the 1st player, without extension
+        :param second_path: path of the policy played as another player, without extension
+        """
+        # endregion Summary
+
+        # region Body
+
+        super().__init__(all_states, epsilon=0)
+
+        self.first_path = first_path
+        self.second_path = second_path
+
+        # endregion Body
+
+    # endregion Constructor
+
+    # region Functions
+
+    def set_symbol(self, symbol):
+        # region Summary
+        """
+        Set player's symbol and load the policy of its seat.
+        :param symbol: symbol of the player
+        """
+        # endregion Summary
+
+        # region Body
+
+        self.symbol = symbol
+        self.load_policy(self.first_path if symbol == 1 else self.second_path)
 
         # endregion Body
 
@@ -289,3 +385,120 @@ class HumanPlayer:
         # endregion Body
 
     # endregion Functions
+
+
+class RandomPlayer:
+    # region Constructor
+
+    def __init__(self):
+        # region Summary
+        """
+        Random Player: puts its symbol in a uniformly random empty position
+        """
+        # endregion Summary
+
+        # region Body
+
+        self.symbol = None
+        self.state = None
+
+        # endregion Body
+
+    # endregion Constructor
+
+    # region Functions
+
+    def reset(self):
+        pass
+
+    def set_state(self, state):
+        # region Summary
+        """
+        Set state.
+        :param state: state
+        """
+        # endregion Summary
+
+        # region Body
+
+        self.state = state
+
+        # endregion Body
+
+    def set_symbol(self, symbol):
+        # region Summary
+        """
+        Set random player's symbol.
+        :param symbol: symbol of random player
+        """
+        # endregion Summary
+
+        # region Body
+
+        self.symbol = symbol
+
+        # endregion Body
+
+    def act(self, rows: int = 3, columns: int = 3):
+        # region Summary
+        """
+        Choose a random empty position
+        :param rows: number of board's rows
+        :param columns: number of board's columns
+        :return: action
+        """
+        # endregion Summary
+
+        # region Body
+
+        positions = [(i, j) for i in range(rows) for j in range(columns) if self.state.data[i, j] == 0]
+        i, j = positions[np.random.randint(len(positions))]
+        return i, j, self.symbol
+
+        # endregion Body
+
+    # endregion Functions
+
+
+class SolverPlayer(RandomPlayer):
+    # region Constructor
+
+    def __init__(self, solution=None):
+        # region Summary
+        """
+        Solver Player: plays perfectly, choosing randomly from the optimal moves precomputed by the solver (quicker wins first)
+        :param solution: solver.Solution (solver.get_solution(), if None)
+        """
+        # endregion Summary
+
+        # region Body
+
+        super().__init__()
+
+        self.solution = get_solution() if solution is None else solution
+
+        # endregion Body
+
+    # endregion Constructor
+
+    # region Functions
+
+    def act(self, rows: int = 3, columns: int = 3):
+        # region Summary
+        """
+        Choose randomly from the optimal moves of the current state (a table lookup)
+        :param rows: number of board's rows
+        :param columns: number of board's columns
+        :return: action
+        """
+        # endregion Summary
+
+        # region Body
+
+        positions = self.solution.optimal_positions[self.solution.index[int(self.state.calculate_hash_value())]]
+        i, j = divmod(positions[np.random.randint(len(positions))], columns)
+        return i, j, self.symbol
+
+        # endregion Body
+
+    # endregion Functions
@@ -0,0 +1,189 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+
+# region Fields
+
+# Version of the policy format, written in every header (2: the header records use_symmetry)
+format_version = 2
+
+# endregion Fields
+
+class PolicyTable:
+    # region Constructor
+
+    def __init__(self, hashes, values):
+        # region Summary
+        """
+        Table of state value estimations held as 2 aligned arrays, usable in place of the dictionary of RLPlayer.state_value_estimations.
+        :param hashes: (n_states,) sorted int64 hash values of states (the state index)
+        :param values: (n_states,) state value estimations (e.g. a copy-on-write memory map: updates never reach the file)
+        """
+        # endregion Summary
+
+        # region Body
+
+        self.hashes = hashes
+        self.values = values
+
+        # endregion Body
+
+    # endregion Constructor
+
+    # region Functions
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def __iter__(self):
+        return iter(self.hashes.tolist())
+
+    def index(self, hash_value):
+        # region Summary
+        """
+        Get the index of a state in the table.
+        :param hash_value: hash value of the state
+        :return: index, or -1 if the state is not in the table
+        """
+        # endregion Summary
+
+        # region Body
+
+        hash_value = int(hash_value)
+        i = int(np.searchsorted(self.hashes, hash_value))
+
+        return i if i < len(self.hashes) and self.hashes[i] == hash_value else -1
+
+        # endregion Body
+
+    def __contains__(self, hash_value):
+        return self.index(hash_value) >= 0
+
+    def __getitem__(self, hash_value):
+        # region Summary
+        """
+        Get the estimation of a state.
+        :param hash_value: hash value of the state
+        :return: estimation
+        """
+        # endregion Summary
+
+        # region Body
+
+        i = self.index(hash_value)
+        if i < 0:
+            raise KeyError(hash_value)
+
+        return float(self.values[i])
+
+        # endregion Body
+
+    def __setitem__(self, hash_value, value):
+        # region Summary
+        """
+        Set the estimation of a state (states must be in the table).
+        :param hash_value: hash value of the state
+        :param value: estimation
+        """
+        # endregion Summary
+
+        # region Body
+
+        i = self.index(hash_value)
+        if i < 0:
+            raise KeyError(hash_value)
+
+        self.values[i] = value
+
+        # endregion Body
+
+    def items(self):
+        # region Summary
+        """
+        Get the (hash value, estimation) pairs.
+        :return: iterator of pairs
+        """
+        # endregion Summary
+
+        # region Body
+
+        return zip(self.hashes.tolist(), self.values.tolist())
+
+        # endregion Body
+
+    # endregion Functions
+
+
+def save_policy(path, state_value_estimations, rows: int = 3, columns: int = 3, symbol: int = 1, step_size: float = 0.1,
+                epsilon: float = 0.1, epochs: int = 0, use_symmetry: bool = False):
+    # region Summary
+    """
+    Save a policy as a dense float32 array (<path>.npy) aligned to a state index (state_index_<rows>x<columns>_<digest>.npy,
+    shared by all policies over the same states, in the same directory) and a JSON header (<path>.json).
+    :param path: path of the policy, without extension
+    :param state_value_estimations: dictionary (or PolicyTable): hash value => state value estimation
+    :param rows: number of board's rows
+    :param columns: number of board's columns
+    :param symbol: symbol of the player
+    :param step_size: (denoted as 𝛼) the step size the estimations were updated with
+    :param epsilon: (denoted as ε) the probability to explore the estimations were learned with
+    :param epochs: number of epochs trained
+    :param use_symmetry: True, if the estimations are keyed by canonical hash values (see RLPlayer.get_key())
+    """
+    # endregion Summary
+
+    # region Body
+
+    # Align the estimations to the sorted hash values of their states
+    pairs = sorted((int(hash_value), value) for hash_value, value in state_value_estimations.items())
+    hashes = np.array([hash_value for hash_value, _ in pairs], dtype=np.int64)
+    values = np.array([value for _, value in pairs], dtype=np.float32)
+
+    # The state index is named after its content, so different sets of states (e.g. canonical states) never overwrite each other
+    state_index = 'state_index_%dx%d_%s.npy' % (rows, columns, hashlib.sha1(hashes.tobytes()).hexdigest()[:8])
+    state_index_path = os.path.join(os.path.dirname(os.path.abspath(path)), state_index)
+    if not os.path.exists(state_index_path):
+        np.save(state_index_path, hashes)
+
+    np.save(path + '.npy', values)
+
+    header = dict(version=format_version, rows=rows, columns=columns, symbol=symbol, step_size=step_size, epsilon=epsilon,
+                  epochs=epochs, use_symmetry=use_symmetry, states=len(hashes), state_index=state_index)
+    with open(path + '.json', 'w') as f:
+        json.dump(header, f, indent=4)
+
+    # endregion Body
+
+
+def load_policy(path):
+    # region Summary
+    """
+    Load a policy saved by save_policy(): the arrays are memory-mapped (copy-on-write, so updates never reach the files),
+    and no pickled object is ever loaded. Version 1 headers, written before use_symmetry was recorded, hold all states.
+    :param path: path of the policy, without extension
+    :return: header (dictionary), PolicyTable
+    """
+    # endregion Summary
+
+    # region Body
+
+    with open(path + '.json') as f:
+        header = json.load(f)
+
+    if header['version'] == 1:
+        # Version 1 policies were always saved over all states
+        header['use_symmetry'] = False
+    elif header['version'] != format_version:
+        raise ValueError('Unsupported policy format version: %s' % header['version'])
+
+    hashes = np.load(os.path.join(os.path.dirname(os.path.abspath(path)), header['state_index']), mmap_mode='r', allow_pickle=False)
+    values = np.load(path + '.npy', mmap_mode='c', allow_pickle=False)
+
+    if len(hashes) != header['states'] or len(values) != header['states']:
+        raise ValueError('Policy %s does not match its state index' % path)
+
+    return header, PolicyTable(hashes, values)
+
+    # endregion Body
@@ -0,0 +1,216 @@
+import os
+
+import numpy as np
+
+from state_graph import get_state_graph
+
+# region Fields
+
+# Kinds of transposition table entries: the exact score, a lower bound (the search failed high) or an upper bound (it failed low)
+exact = 0
+lower_bound = 1
+upper_bound = 2
+
+# endregion Fields
+
+class Solver:
+    # region Constructor
+
+    def __init__(self, graph):
+        # region Summary
+        """
+        Negamax solver with alpha-beta pruning and a transposition table over the state graph. Scores are from the point of view
+        of the player to move: 0 for a tie, 1 + (number of empty positions when the game ends) for a win and the opposite for a loss,
+        so that quicker wins (and slower losses) score higher.
+        :param graph: StateGraph
+        """
+        # endregion Summary
+
+        # region Body
+
+        self.graph = graph
+
+        # Plain lists are much faster than arrays for the scalar lookups of the search
+        self.next_states = [[next_state for next_state in row if next_state >= 0] for row in graph.successors.tolist()]
+        self.terminal = graph.terminal.tolist()
+        self.winner = graph.winner.tolist()
+
+        # Number of empty positions of every state (base-3 digits of the hash value equal to 1)
+        self.empty_positions = np.count_nonzero(graph.hashes[:, None] // 3 ** np.arange(graph.successors.shape[1]) % 3 == 1, axis=1).tolist()
+
+        # Transposition table: state index => (score, kind of entry)
+        self.transposition_table = dict()
+
+        # Number of searched nodes
+        self.nodes = 0
+
+        # endregion Body
+
+    # endregion Constructor
+
+    # region Functions
+
+    def negamax(self, state, alpha, beta):
+        # region Summary
+        """
+        Search the score of a state within a window.
+        :param state: index of the state
+        :param alpha: lower bound of the window
+        :param beta: upper bound of the window
+        :return: the exact score, if it lies within (alpha, beta); otherwise, a bound on the wrong side of the window
+        """
+        # endregion Summary
+
+        # region Body
+
+        self.nodes += 1
+
+        # The game ended: the last move was made by another player, so the player to move lost or tied
+        if self.terminal[state]:
+            return 0 if self.winner[state] == 0 else -(1 + self.empty_positions[state])
+
+        # Look the state up in the transposition table
+        if state in self.transposition_table:
+            score, kind = self.transposition_table[state]
+            if kind == exact or (kind == lower_bound and score >= beta) or (kind == upper_bound and score <= alpha):
+                return score
+
+        original_alpha = alpha
+        best_score = -np.inf
+        for next_state in self.next_states[state]:
+            score = -self.negamax(next_state, -beta, -alpha)
+            best_score = max(best_score, score)
+            alpha = max(alpha, score)
+
+            # Cut-off: another player will avoid this state
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            self.transposition_table[state] = (best_score, upper_bound)
+        elif best_score >= beta:
+            self.transposition_table[state] = (best_score, lower_bound)
+        else:
+            self.transposition_table[state] = (best_score, exact)
+
+        return best_score
+
+        # endregion Body
+
+    def solve(self):
+        # region Summary
+        """
+        Compute the exact scores of all states (with a window wider than any score, every search is exact).
+        :return: (n_states,) int8 scores
+        """
+        # endregion Summary
+
+        # region Body
+
+        window = len(self.graph.successors[0]) + 2
+
+        return np.array([self.negamax(state, -window, window) for state in range(len(self.graph.hashes))], dtype=np.int8)
+
+        # endregion Body
+
+    # endregion Functions
+
+
+class Solution:
+    # region Constructor
+
+    def __init__(self, graph, scores):
+        # region Summary
+        """
+        Solution of the game: exact scores and optimal moves of all states.
+        :param graph: StateGraph
+        :param scores: (n_states,) scores from the point of view of the player to move (see Solver)
+        """
+        # endregion Summary
+
+        # region Body
+
+        self.graph = graph
+        self.scores = scores
+
+        # Game-theoretic values from the point of view of the player to move: 1 (win), 0 (tie), -1 (loss)
+        self.values = np.sign(scores).astype(np.int8)
+
+        # Optimal moves: the positions whose next states have the lowest score for another player
+        next_scores = np.where(graph.successors >= 0, -scores[graph.successors].astype(np.int64), np.iinfo(np.int64).min)
+        self.optimal_moves = (graph.successors >= 0) & (next_scores == next_scores.max(axis=1, keepdims=True))
+
+        # Optimal positions of every state (empty for the states in which the game ended)
+        self.optimal_positions = [np.flatnonzero(row).tolist() for row in self.optimal_moves]
+
+        # State index of every hash value
+        self.index = {hash_value: i for i, hash_value in enumerate(graph.hashes.tolist())}
+
+        # endregion Body
+
+    # endregion Constructor
+
+    # region Functions
+
+    def compare_estimations(self, state_value_estimations, symbol):
+        # region Summary
+        """
+        Measure how far the state value estimations of a player are from optimal play.
+        :param state_value_estimations: dictionary (or PolicyTable): hash value => state value estimation
+        :param symbol: symbol of the player
+        :return: fraction of the player's states (the game still on, the player to move) in which every greedy move is optimal,
+                 mean absolute error of the estimations with respect to the game-theoretic values (1 win, 0.5 tie, 0 loss)
+        """
+        # endregion Summary
+
+        # region Body
+
+        graph = self.graph
+        estimations = np.array([state_value_estimations[hash_value] for hash_value in graph.hashes.tolist()])
+
+        # Game-theoretic values from the point of view of the player, on the scale of the estimations
+        values = np.where(graph.player == symbol, self.values, -self.values)
+        optimal_estimations = (values + 1) / 2
+
+        # Greedy moves of the player's states
+        states = np.flatnonzero((graph.player == symbol) & ~graph.terminal)
+        next_estimations = np.where(graph.successors[states] >= 0, estimations[graph.successors[states]], -np.inf)
+        greedy_moves = next_estimations == next_estimations.max(axis=1, keepdims=True)
+
+        agreement = np.mean(np.all(~greedy_moves | self.optimal_moves[states], axis=1))
+        error = np.mean(np.abs(estimations - optimal_estimations))
+
+        return agreement, error
+
+        # endregion Body
+
+    # endregion Functions
+
+
+def get_solution(rows: int = 3, columns: int = 3, path=None):
+    # region Summary
+    """
+    Get the solution of the game, solving it once and caching the scores to disk.
+    :param rows: number of board's rows
+    :param columns: number of board's columns
+    :param path: path of the cache file (solution_<rows>x<columns>.npy next to this module, if None)
+    :return: Solution
+    """
+    # endregion Summary
+
+    # region Body
+
+    if path is None:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'solution_%dx%d.npy' % (rows, columns))
+
+    graph = get_state_graph(rows, columns)
+
+    if os.path.exists(path):
+        scores = np.load(path, allow_pickle=False)
+    else:
+        scores = Solver(graph).solve()
+        np.save(path, scores)
+
+    return Solution(graph, scores)
+
+    # endregion Body
@@ -35,6 +35,9 @@ class State:
         # True, if the game ended; otherwise, false
         self.game_ended = None
 
+        # Hash value of the representative of the state's symmetry class
+        self.canonical_hash_value = None
+
         # endregion Body
 
     # endregion Constructor
@@ -59,6 +62,23 @@ class State:
 
         # endregion Body
 
+    def calculate_canonical_hash_value(self):
+        # region Summary
+        """
+        Calculates the hash value of the state's canonical representative: the least hash value over all rotations and
+        reflections of the board (which all have the same value).
+        :return: canonical hash value
+        """
+        # endregion Summary
+
+        # region Body
+
+        if self.canonical_hash_value is None:
+            self.canonical_hash_value = calculate_canonical_hash_value(self.data)
+        return self.canonical_hash_value
+
+        # endregion Body
+
     def is_game_ended(self):
         # region Summary
         """
@@ -169,6 +189,57 @@ class State:
     # endregion Functions
 
 
+def get_symmetries(rows: int = 3, columns: int = 3):
+    # region Summary
+    """
+    Get the symmetries of the board as permutations of positions: the 8 rotations and reflections of the dihedral group
+    on square boards, the 4 that preserve the shape on the others.
+    :param rows: Number of board's rows
+    :param columns: Number of board's columns
+    :return: (symmetries, rows * columns) array: the transformed board (flattened) is board.flatten()[permutation]
+    """
+    # endregion Summary
+
+    # region Body
+
+    positions = np.arange(rows * columns).reshape(rows, columns)
+
+    # Identity and reflections along both axes, each optionally followed by a rotation of 180°
+    boards = [positions, np.flipud(positions), np.fliplr(positions), np.rot90(positions, 2)]
+
+    # Rotations of 90° and 270°, and reflections along both diagonals
+    if rows == columns:
+        boards += [np.rot90(positions, 1), np.rot90(positions, 3), positions.T, np.rot90(positions, 2).T]
+
+    return np.array([board.flatten() for board in boards])
+
+    # endregion Body
+
+
+def calculate_canonical_hash_value(data):
+    # region Summary
+    """
+    Calculates the canonical hash value of boards: the least hash value (as State.calculate_hash_value()) over all symmetries.
+    :param data: (..., rows, columns) board(s)
+    :return: canonical hash value(s)
+    """
+    # endregion Summary
+
+    # region Body
+
+    rows, columns = np.shape(data)[-2:]
+
+    # Digits (symbol + 1) of every symmetric board, the 1st position being the most significant
+    digits = np.reshape(data, np.shape(data)[:-2] + (rows * columns,))[..., get_symmetries(rows, columns)] + 1
+    powers = 3 ** np.arange(rows * columns - 1, -1, -1)
+
+    hash_values = np.min(digits.astype(np.int64) @ powers, axis=-1)
+
+    return int(hash_values) if np.ndim(hash_values) == 0 else hash_values
+
+    # endregion Body
+
+
 def _get_all_states(current_state, current_symbol, all_states, rows: int = 3, columns: int = 3):
     # region Summary
     """
@@ -0,0 +1,303 @@
+import os
+
+import numpy as np
+
+from bitboard_state import get_all_states
+from state import calculate_canonical_hash_value
+
+class StateGraph:
+    # region Constructor
+
+    def __init__(self, hashes, successors, winner, terminal, player, rows: int = 3, columns: int = 3):
+        # region Summary
+        """
+        Compiled graph of all states of the game. States are densely numbered in the order of their hash values.
+        :param hashes: (n_states,) int64 hash values of states (as State.calculate_hash_value()), sorted
+        :param successors: (n_states, rows * columns) int32 index of the state reached by the player to move putting his symbol
+                           in each position (row-major), or -1 if the position is taken or the game ended
+        :param winner: (n_states,) int8 winner of the game (1 or -1), 0 for a tie or a game that is still on
+        :param terminal: (n_states,) bool, True if the game ended
+        :param player: (n_states,) int8 symbol of the player to move (1 or -1)
+        :param rows: number of board's rows
+        :param columns: number of board's columns
+        """
+        # endregion Summary
+
+        # region Body
+
+        self.hashes = hashes
+        self.successors = successors
+        self.winner = winner
+        self.terminal = terminal
+        self.player = player
+        self.rows = rows
+        self.columns = columns
+
+        # Index of every hash value
+        self.indices = dict(zip(hashes.tolist(), range(len(hashes))))
+
+        # Index of the empty board, where every game starts
+        self.initial_state = self.index_of(sum(3 ** i for i in range(rows * columns)))
+
+        # Boards decoded from the hash values: each position is a base-3 digit, symbol + 1
+        powers = 3 ** np.arange(rows * columns - 1, -1, -1)
+        boards = (hashes[:, None] // powers % 3 - 1).reshape(-1, rows, columns)
+
+        # Index of the canonical representative of every state (the state with the least hash value among its symmetries)
+        self.canonical = np.searchsorted(hashes, calculate_canonical_hash_value(boards)).astype(np.int32)
+
+        # endregion Body
+
+    # endregion Constructor
+
+    # region Functions
+
+    @classmethod
+    def build(cls, rows: int = 3, columns: int = 3):
+        # region Summary
+        """
+        Build the state graph by enumerating all states.
+        :param rows: number of board's rows
+        :param columns: number of board's columns
+        :return: StateGraph
+        """
+        # endregion Summary
+
+        # region Body
+
+        all_states = get_all_states(rows, columns)
+
+        # Number states densely in the order of their hash values
+        hashes = np.array(sorted(int(hash_value) for hash_value in all_states), dtype=np.int64)
+        index = {int(hash_value): i for i, hash_value in enumerate(hashes)}
+
+        successors = np.full((len(hashes), rows * columns), -1, dtype=np.int32)
+        winner = np.zeros(len(hashes), dtype=np.int8)
+        terminal = np.zeros(len(hashes), dtype=bool)
+        player = np.zeros(len(hashes), dtype=np.int8)
+
+        for hash_value, (state, is_end) in all_states.items():
+            i = index[int(hash_value)]
+            terminal[i] = is_end
+            winner[i] = state.winner or 0
+
+            # The 1st player moves when both players have put the same number of symbols
+            player[i] = 1 if np.sum(state.data) == 0 else -1
+
+            if is_end:
+                continue
+
+            # Link every empty position to the state reached by the player to move
+            for position in range(rows * columns):
+                r, c = divmod(position, columns)
+                if state.data[r, c] == 0:
+                    successors[i, position] = index[int(state.get_next_state(r, c, player[i]).calculate_hash_value())]
+
+        return cls(hashes, successors, winner, terminal, player, rows, columns)
+
+        # endregion Body
+
+    def save(self, path):
+        # region Summary
+        """
+        Save the state graph to a .npz file.
+        :param path: Path of the file
+        """
+        # endregion Summary
+
+        # region Body
+
+        np.savez(path, hashes=self.hashes, successors=self.successors, winner=self.winner, terminal=self.terminal,
+                 player=self.player, rows=self.rows, columns=self.columns)
+
+        # endregion Body
+
+    @classmethod
+    def load(cls, path):
+        # region Summary
+        """
+        Load a state graph from a .npz file.
+        :param path: Path of the file
+        :return: StateGraph
+        """
+        # endregion Summary
+
+        # region Body
+
+        with np.load(path) as data:
+            return cls(data['hashes'], data['successors'], data['winner'], data['terminal'], data['player'], int(data['rows']), int(data['columns']))
+
+        # endregion Body
+
+    def index_of(self, hash_value):
+        # region Summary
+        """
+        Get the index of a state.
+        :param hash_value: hash value of the state (as State.calculate_hash_value())
+        :return: index of the state
+        """
+        # endregion Summary
+
+        # region Body
+
+        return int(np.searchsorted(self.hashes, int(hash_value)))
+
+        # endregion Body
+
+    def initial_values(self, symbol):
+        # region Summary
+        """
+        Initial state value estimations of a player (as RLPlayer.set_symbol()): 1 for won games, 0.5 for ties and games that are still on,
+        0 for lost games.
+        :param symbol: symbol of the player
+        :return: (n_states,) state value estimations
+        """
+        # endregion Summary
+
+        # region Body
+
+        values = np.full(len(self.hashes), 0.5)
+        values[self.terminal & (self.winner == symbol)] = 1.0
+        values[self.terminal & (self.winner == -symbol)] = 0.0
+
+        return values
+
+        # endregion Body
+
+    def to_dictionary(self, values, use_symmetry: bool = False):
+        # region Summary
+        """
+        Convert state value estimations to a dictionary keyed by hash values (as RLPlayer.state_value_estimations).
+        :param values: (n_states,) state value estimations
+        :param use_symmetry: if True, keep the canonical states only (as RLPlayer with use_symmetry=True)
+        :return: dictionary: hash value => state value estimation
+        """
+        # endregion Summary
+
+        # region Body
+
+        values = np.asarray(values, dtype=float)
+
+        if use_symmetry:
+            # Canonical states are their own representatives
+            is_canonical = self.canonical == np.arange(len(self.hashes))
+            return dict(zip(self.hashes[is_canonical].tolist(), values[is_canonical].tolist()))
+
+        return dict(zip(self.hashes.tolist(), values.tolist()))
+
+        # endregion Body
+
+    # endregion Functions
+
+
+def get_state_graph(rows: int = 3, columns: int = 3, path=None):
+    # region Summary
+    """
+    Get the state graph, building it once and caching it to disk.
+    :param rows: number of board's rows
+    :param columns: number of board's columns
+    :param path: path of the cache file (state_graph_<rows>x<columns>.npz next to this module, if None)
+    :return: StateGraph
+    """
+    # endregion Summary
+
+    # region Body
+
+    if path is None:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'state_graph_%dx%d.npz' % (rows, columns))
+
+    if os.path.exists(path):
+        return StateGraph.load(path)
+
+    graph = StateGraph.build(rows, columns)
+    graph.save(path)
+    return graph
+
+    # endregion Body
+
+
+def train_on_graph(graph, epochs: int, step_size: float = 0.1, epsilon: float = 0.1, print_every_n: int = 500, use_symmetry: bool = False):
+    # region Summary
+    """
+    Train 2 RL players by self-play on the state graph. Games follow the semantics of Judge.play() and RLPlayer: both players
+    record every state of the game, an exploratory move (with probability ε) marks the state it was made from as non-greedy,
+    greedy moves break ties between equal values randomly, and after every game each player updates its state value estimations
+    in reverse order: 𝑉(𝑆_𝑡) = 𝑉(𝑆_𝑡) + 𝛼(𝑉(𝑆_(𝑡 + 1)) − 𝑉(𝑆_𝑡)), if the move made in 𝑆_𝑡 was greedy.
+    :param graph: StateGraph
+    :param epochs: number of epochs (games) for training
+    :param step_size: (denoted as 𝛼) the step size to update estimations
+    :param epsilon: (denoted as ε) the probability to explore
+    :param print_every_n: number of epochs to print the intermediate win rate
+    :param use_symmetry: if True, learn on canonical states only (as RLPlayer): all rotations and reflections of a board share 1 estimation
+    :return: (2, n_states) state value estimations of the 1st and the 2nd player (for all states, symmetric states holding equal estimations),
+             number of wins of the 1st and the 2nd player
+    """
+    # endregion Summary
+
+    # region Body
+
+    # Plain lists are much faster than arrays for the scalar lookups of a single game
+    next_states = [[next_state for next_state in row if next_state >= 0] for row in graph.successors.tolist()]
+    terminal = graph.terminal.tolist()
+    winner = graph.winner.tolist()
+
+    # Index of the estimation of every state
+    keys = graph.canonical.tolist() if use_symmetry else list(range(len(terminal)))
+
+    # State value estimations (denoted as 𝑉(𝑆)) of both players
+    values = [graph.initial_values(1).tolist(), graph.initial_values(-1).tolist()]
+
+    # Set the initial win rate of both players to 0
+    wins = [0, 0]
+
+    for epoch in range(1, 1 + epochs):
+        # Every game starts from the empty board, with the 1st player to move
+        state = graph.initial_state
+        states = [state]
+        greedy = [[True], [True]]
+        player = 0
+
+        while not terminal[state]:
+            player_values = values[player]
+            candidates = next_states[state]
+
+            # Exploratory move: select randomly (with small probability ε) from among all moves
+            if np.random.random() < epsilon:
+                state = candidates[int(np.random.random() * len(candidates))]
+                greedy[player][-1] = False
+
+            # Greedy move: select randomly from the moves that lead to the state with the greatest estimated value
+            else:
+                best_value = max(player_values[keys[candidate]] for candidate in candidates)
+                best_candidates = [candidate for candidate in candidates if player_values[keys[candidate]] == best_value]
+                state = best_candidates[int(np.random.random() * len(best_candidates))]
+
+            # Both players acquire the next state
+            states.append(state)
+            greedy[0].append(True)
+            greedy[1].append(True)
+
+            # Alternate players
+            player = 1 - player
+
+        # check which player is the winner
+        if winner[state] == 1:
+            wins[0] += 1
+        if winner[state] == -1:
+            wins[1] += 1
+
+        # print the intermediate win rates, if needed
+        if epoch % print_every_n == 0:
+            print(f'epoch n:{epoch}, win rate player 1:{wins[0]}, win rate player 2:{wins[1]}')
+
+        # update value estimates of both players (temporal-difference learning method)
+        state_keys = [keys[state] for state in states]
+        for player_values, player_greedy in zip(values, greedy):
+            for t in reversed(range(len(state_keys) - 1)):
+                if player_greedy[t]:
+                    player_values[state_keys[t]] += step_size * (player_values[state_keys[t + 1]] - player_values[state_keys[t]])
+
+    # Symmetric states take the estimation of their canonical representative
+    return np.array(values)[:, keys], wins
+
+    # endregion Body
@@ -1,59 +1,40 @@
-from state import get_all_states
+from bitboard_state import get_all_states
 from player import RLPlayer, HumanPlayer
 from judge import Judge
+from state_graph import get_state_graph, train_on_graph
 
 # Get all possible board configurations
 all_states = get_all_states(rows=3, columns=3)
 
 # region Functions
 
-def train(epochs: int, print_every_n: int = 500):
+def train(epochs: int, print_every_n: int = 500, use_symmetry: bool = False):
     # region Summary
     """
     Train 2 RL players
     :param epochs: number of epochs for training
     :param print_every_n: number of epochs to print the intermediate win rate
+    :param use_symmetry: if True, learn on canonical states only (all rotations and reflections of a board share 1 estimation)
     """
     # endregion Summary
 
     # region Body
 
-    # Create 2 RL players with ε = 0.01 exploring probability
-    player1 = RLPlayer(all_states, epsilon=0.01)
-    player2 = RLPlayer(all_states, epsilon=0.01)
+    # Get the compiled graph of all states (built once and cached to disk)
+    graph = get_state_graph(rows=3, columns=3)
 
-    # Create a judge to organize the game
-    judge = Judge(player1, player2)
-
-    # Set the initial win rate of both players to 0
-    player1_win_rate = 0
-    player2_win_rate = 0
-
-    # For every epoch
-    for epoch in range(1, 1 + epochs):
-
-
-        # get the winner
-
-        winner = judge.play(all_states)
+    # Train 2 RL players with ε = 0.01 exploring probability on the state graph
+    values, _ = train_on_graph(graph, epochs, epsilon=0.01, print_every_n=print_every_n, use_symmetry=use_symmetry)
 
-        # check which player is the winner
-        if winner == 1:
-            player1_win_rate += 1
-        if winner == -1:
-            player2_win_rate += 1
-
-        # print the intermediate win rates, if needed
-        if epoch % print_every_n == 0:
-            print(f'epoch n:{epoch}, win rate player 1:{player1_win_rate}, win rate player 2:{player2_win_rate}')
-
-
-        # update value estimates of both players
-        player1.update_state_value_estimates()
-        player2.update_state_value_estimates()
-
-        # reset the judge => players
-        judge.reset()
+    # Create 2 RL players holding the trained state value estimations (of canonical states only, if symmetries are used)
+    player1 = RLPlayer(all_states, epsilon=0.01, use_symmetry=use_symmetry, graph=graph)
+    player2 = RLPlayer(all_states, epsilon=0.01, use_symmetry=use_symmetry, graph=graph)
+    player1.set_symbol(1)
+    player2.set_symbol(-1)
+    player1.state_value_estimations = graph.to_dictionary(values[0], use_symmetry)
+    player2.state_value_estimations = graph.to_dictionary(values[1], use_symmetry)
+    player1.epochs = epochs
+    player2.epochs = epochs
 
     # Save the players' policies
     player1.save_policy()
@@ -67,6 +48,7 @@ def compete(turns):
     """
     Compete trained RL players
     :param turns: number of turns for competition
+    :return: number of wins of player 1, number of wins of player 2, number of ties
     """
     # endregion Summary
 
@@ -103,7 +85,11 @@ def compete(turns):
         # reset the judge => players
         judge.reset()
 
+    # Print and return the results of the competition
+    ties = turns - player1_win_rate - player2_win_rate
+    print(f'turns:{turns}, win rate player 1:{player1_win_rate / turns}, win rate player 2:{player2_win_rate / turns}, tie rate:{ties / turns}')
 
+    return player1_win_rate, player2_win_rate, ties
 
     # endregion Body
 
@@ -0,0 +1,248 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from bitboard_state import get_all_states
+from judge import Judge
+from player import RandomPlayer, SolverPlayer, PolicyPlayer
+
+# region Fields
+
+# Worker's dictionary of all states (built on the 1st game played by the process)
+all_states = None
+
+# endregion Fields
+
+# region Functions
+
+# region Agents
+
+def random_agent(states):
+    # region Summary
+    """
+    Create a random player.
+    :param states: dictionary of all states
+    :return: RandomPlayer
+    """
+    # endregion Summary
+
+    # region Body
+
+    return RandomPlayer()
+
+    # endregion Body
+
+def solver_agent(states):
+    # region Summary
+    """
+    Create a perfect player (following the solution precomputed by the solver).
+    :param states: dictionary of all states
+    :return: SolverPlayer
+    """
+    # endregion Summary
+
+    # region Body
+
+    return SolverPlayer()
+
+    # endregion Body
+
+def policy_agent(states, first_path='policy_first', second_path='policy_second'):
+    # region Summary
+    """
+    Create a greedy player following saved policies.
+    :param states: dictionary of all states
+    :param first_path: path of the policy played as the 1st player, without extension
+    :param second_path: path of the policy played as another player, without extension
+    :return: PolicyPlayer
+    """
+    # endregion Summary
+
+    # region Body
+
+    return PolicyPlayer(states, first_path, second_path)
+
+    # endregion Body
+
+def default_agents(policies=None):
+    # region Summary
+    """
+    Get a pool of agents: a random player, a perfect player and the given saved policies.
+    :param policies: dictionary: name => (path of the 1st player's policy, path of another player's policy) (the policies in the
+                     current directory, if None)
+    :return: dictionary: name => agent factory, called with the dictionary of all states
+    """
+    # endregion Summary
+
+    # region Body
+
+    policies = dict(policy=('policy_first', 'policy_second')) if policies is None else policies
+
+    agents = dict(random=random_agent, solver=solver_agent)
+    for name, (first_path, second_path) in policies.items():
+        agents[name] = partial(policy_agent, first_path=first_path, second_path=second_path)
+
+    return agents
+
+    # endregion Body
+
+# endregion Agents
+
+def play_pairing(first_agent, second_agent, games: int, seed_sequence):
+    # region Summary
+    """
+    Play games between 2 agents in fixed seats.
+    :param first_agent: factory of the player who moves first
+    :param second_agent: factory of another player
+    :param games: number of games
+    :param seed_sequence: np.random.SeedSequence of the pairing (players draw from the global np.random)
+    :return: wins of the 1st player, draws, wins of another player
+    """
+    # endregion Summary
+
+    # region Body
+
+    global all_states
+    if all_states is None:
+        all_states = get_all_states()
+
+    np.random.seed(seed_sequence.generate_state(1))
+
+    # Create a judge to organize the games
+    judge = Judge(first_agent(all_states), second_agent(all_states))
+
+    results = [0, 0, 0]
+    for _ in range(games):
+        winner = judge.play(all_states)
+
+        # count the winner: 1 → index 0, tie → index 1, -1 → index 2
+        results[1 - winner] += 1
+
+    return tuple(results)
+
+    # endregion Body
+
+def tournament(agents, games: int = 100, workers=None, seed=None):
+    # region Summary
+    """
+    Round-robin tournament: every pairing of agents (including each agent against itself) plays games in both seat orders,
+    and the pairings are played in parallel on a process pool.
+    :param agents: dictionary: name => agent factory, called with the dictionary of all states (see default_agents());
+                   factories must be picklable (module-level functions or functools.partial of them)
+    :param games: number of games of every pairing in every seat order
+    :param workers: number of worker processes (os.cpu_count(), if None)
+    :param seed: seed of the root np.random.SeedSequence (fresh entropy, if None)
+    :return: dictionary with names of agents, (n_agents, n_agents) matrices wins, draws and losses (row agent against column agent,
+             over both seat orders; on the diagonal, an agent playing 1st against itself), seat_wins ((n_agents, n_agents) wins of
+             the row agent playing 1st) and Elo ratings
+    """
+    # endregion Summary
+
+    # region Body
+
+    workers = os.cpu_count() if workers is None else workers
+
+    names = list(agents)
+    pairings = list(itertools.product(range(len(names)), repeat=2))
+    seed_sequences = np.random.SeedSequence(seed).spawn(len(pairings))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(play_pairing, [agents[names[i]] for i, _ in pairings], [agents[names[j]] for _, j in pairings],
+                                    [games] * len(pairings), seed_sequences))
+
+    wins = np.zeros((len(names), len(names)), dtype=np.int64)
+    draws = np.zeros((len(names), len(names)), dtype=np.int64)
+    losses = np.zeros((len(names), len(names)), dtype=np.int64)
+    seat_wins = np.zeros((len(names), len(names)), dtype=np.int64)
+
+    # Row agent i played 1st against column agent j
+    for (i, j), (first_wins, ties, second_wins) in zip(pairings, results):
+        wins[i, j] += first_wins
+        draws[i, j] += ties
+        losses[i, j] += second_wins
+        seat_wins[i, j] = first_wins
+
+        # An agent against itself has 1 cell, from the point of view of its 1st seat: every game is counted once
+        if i != j:
+            wins[j, i] += second_wins
+            draws[j, i] += ties
+            losses[j, i] += first_wins
+
+    return dict(names=names, wins=wins, draws=draws, losses=losses, seat_wins=seat_wins, elo=elo_ratings(wins, draws))
+
+    # endregion Body
+
+def elo_ratings(wins, draws, prior: float = 1.0, iterations: int = 1000, tolerance: float = 1e-9):
+    # region Summary
+    """
+    Elo ratings fitted by a Bradley–Terry model: agent i beats agent j with probability 𝛾_𝑖 / (𝛾_𝑖 + 𝛾_𝑗), draws counting as half a win
+    for both. Every pair of distinct agents that met gets `prior` virtual draws, which keeps the ratings of unbeaten (or winless)
+    agents finite. Strengths are fitted by minorization–maximization: 𝛾_𝑖 = 𝑊_𝑖 / ∑_𝑗 𝑁_𝑖𝑗 / (𝛾_𝑖 + 𝛾_𝑗).
+    :param wins: (n_agents, n_agents) wins of the row agent against the column agent
+    :param draws: (n_agents, n_agents) draws between agents (symmetric)
+    :param prior: number of virtual draws of every pair of agents that met
+    :param iterations: maximum number of iterations
+    :param tolerance: stop when no log-strength changes more than this
+    :return: (n_agents,) Elo ratings (400 log10 𝛾), with a mean of 0
+    """
+    # endregion Summary
+
+    # region Body
+
+    # Games against themselves carry no information
+    wins = np.asarray(wins, dtype=float) * (1 - np.eye(len(wins)))
+    draws = np.asarray(draws, dtype=float) * (1 - np.eye(len(wins)))
+
+    # Pairs that met get the virtual draws
+    met = (wins + wins.T + draws) > 0
+    draws = draws + prior * met
+
+    # Scores (denoted as 𝑊_𝑖) and numbers of games (denoted as 𝑁_𝑖𝑗)
+    scores = np.sum(wins + draws / 2, axis=1)
+    games = wins + wins.T + draws
+
+    strengths = np.ones(len(wins))
+    for _ in range(iterations):
+        new_strengths = scores / np.sum(games / (strengths[:, None] + strengths[None, :]), axis=1)
+
+        # Agents that met nobody keep the neutral strength
+        new_strengths = np.where(scores > 0, new_strengths, 1.0)
+        new_strengths /= np.exp(np.mean(np.log(new_strengths)))
+
+        converged = np.max(np.abs(np.log(new_strengths) - np.log(strengths))) < tolerance
+        strengths = new_strengths
+        if converged:
+            break
+
+    return 400 * np.log10(strengths)
+
+    # endregion Body
+
+def print_results(results):
+    # region Summary
+    """
+    Print the win/draw/loss matrices and the Elo ratings of a tournament.
+    :param results: results of tournament()
+    """
+    # endregion Summary
+
+    # region Body
+
+    names = results['names']
+    width = max(len(name) for name in names) + 2
+
+    print(' ' * width + ''.join(name.rjust(16) for name in names) + 'Elo'.rjust(10))
+    for i, name in enumerate(names):
+        cells = ['%d/%d/%d' % (results['wins'][i, j], results['draws'][i, j], results['losses'][i, j]) for j in range(len(names))]
+        print(name.ljust(width) + ''.join(cell.rjust(16) for cell in cells) + ('%.0f' % results['elo'][i]).rjust(10))
+
+    # endregion Body
+
+# endregion Functions
+
+
+if __name__ == '__main__':
+    print_results(tournament(default_agents(), games=100))
@@ -0,0 +1,83 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from bitboard_state import get_all_states
+from judge import Judge
+from player import RLPlayer, PolicyPlayer, RandomPlayer
+
+
+def test_symmetric_policy_round_trip(tmp_path):
+    all_states = get_all_states()
+
+    # Train 2 symmetric players briefly, so that the estimations differ from their initial values
+    player1 = RLPlayer(all_states, use_symmetry=True)
+    player2 = RLPlayer(all_states, use_symmetry=True)
+    judge = Judge(player1, player2)
+    for _ in range(200):
+        judge.play(all_states)
+        player1.update_state_value_estimates()
+        player2.update_state_value_estimates()
+        judge.reset()
+
+    first_path, second_path = str(tmp_path / 'policy_first'), str(tmp_path / 'policy_second')
+    player1.save_policy(first_path)
+    player2.save_policy(second_path)
+
+    # The canonical estimations are restored, and the player looks states up by their canonical hash values
+    player = RLPlayer(all_states, epsilon=0)
+    player.load_policy(first_path)
+    assert player.use_symmetry
+    assert len(player.state_value_estimations) == len(player1.state_value_estimations)
+    for hash_value, value in player1.state_value_estimations.items():
+        assert np.isclose(player.state_value_estimations[hash_value], value)
+
+    # Policies saved with symmetries play from every state without missing keys
+    for _ in range(50):
+        Judge(PolicyPlayer(all_states, first_path, second_path), RandomPlayer()).play(all_states)
+        Judge(RandomPlayer(), PolicyPlayer(all_states, first_path, second_path)).play(all_states)
+
+
+def test_train_saves_canonical_policy(tmp_path, monkeypatch):
+    from tic_tac_toe import train
+
+    # train() saves the policies in the current directory
+    monkeypatch.chdir(tmp_path)
+    train(50, print_every_n=1000, use_symmetry=True)
+
+    # The canonical table reaches the disk, and the loaded player looks states up by their canonical hash values
+    player = RLPlayer(get_all_states(), epsilon=0)
+    player.load_policy(str(tmp_path / 'policy_first'))
+    assert player.use_symmetry
+    assert len(player.state_value_estimations) == 765
+
+
+def test_version_1_header(tmp_path):
+    import json
+
+    import policy_store
+    import pytest
+
+    path = str(tmp_path / 'policy')
+    policy_store.save_policy(path, {3: 0.25, 1: 0.75})
+
+    # Version 1 headers lack use_symmetry: their policies hold all states
+    with open(path + '.json') as f:
+        header = json.load(f)
+    del header['use_symmetry']
+    header['version'] = 1
+    with open(path + '.json', 'w') as f:
+        json.dump(header, f)
+
+    header, table = policy_store.load_policy(path)
+    assert header['use_symmetry'] is False
+    assert table[1] == 0.75 and table[3] == 0.25
+
+    header['version'] = 3
+    with open(path + '.json', 'w') as f:
+        json.dump(header, f)
+    with pytest.raises(ValueError):
+        policy_store.load_policy(path)